@@ -19,6 +19,7 @@ from fastapi.responses import JSONResponse
 from utils.file_operations import ensure_dir, cleanup_processing_dir, copy_file, merge_json_files, manage_flashcards, safe_move_images, cleanup_large_files, optimize_memory_usage
 from utils.deck_migration import migrate_decks_from_build
 from utils.path_resolver import PathResolver
+from utils.performance_optimizer import get_memory_manager
 
 # Import processing modules - use standard OCR for stability
 process_document_dir = None
@@ -986,6 +987,12 @@ if __name__ == "__main__":
         print("📍 Server will run on http://127.0.0.1:8000")
         print("🔄 Loading models and initializing...")
         
+        # Process-wide runtime tuning belongs to the entry point, not to imports;
+        # full collections are timed at debug level to show the threshold's effect
+        memory_manager = get_memory_manager()
+        memory_manager.tune_gc_threshold()
+        memory_manager.register_gc_callback()
+        
         uvicorn.run(
             app,
             host="127.0.0.1",
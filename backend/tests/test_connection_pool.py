@@ -0,0 +1,56 @@
+import json
+import random
+import unittest
+
+from utils.connection_pool import AdaptiveTimeout, _json_dumps
+
+
+class JsonDumpsTest(unittest.TestCase):
+    
+    def test_matches_stdlib_for_non_str_keys_and_big_ints(self):
+        for value in ({1: 'a'}, {'n': 2 ** 70}):
+            self.assertEqual(json.loads(_json_dumps(value)), json.loads(json.dumps(value)))
+
+
+
+class AdaptiveTimeoutTest(unittest.TestCase):
+    
+    def _expected(self, times, timeout):
+        # Full-sort 95th percentile, as computed before the generation cache
+        p95_time = sorted(times)[int(len(times) * 0.95)]
+        return max(timeout.min_timeout, min(p95_time * 1.5, timeout.max_timeout))
+    
+    def test_initial_timeout_until_enough_samples(self):
+        timeout = AdaptiveTimeout(initial_timeout=30.0)
+        for _ in range(4):
+            timeout.record_response_time('api', 10.0)
+        
+        self.assertEqual(timeout.get_timeout('api'), 30.0)
+        self.assertEqual(timeout.get_timeout('other'), 30.0)
+    
+    def test_cached_timeout_follows_new_samples(self):
+        rng = random.Random(0)
+        timeout = AdaptiveTimeout()
+        times = []
+        for _ in range(80):
+            sample = rng.uniform(1.0, 20.0)
+            times.append(sample)
+            timeout.record_response_time('api', sample)
+            if len(times) >= 5:
+                window = times[-50:]
+                self.assertEqual(timeout.get_timeout('api'), self._expected(window, timeout))
+                # A repeated call is served from the cache with the same answer
+                self.assertEqual(timeout.get_timeout('api'), self._expected(window, timeout))
+    
+    def test_timeout_is_clamped(self):
+        timeout = AdaptiveTimeout(min_timeout=5.0, max_timeout=60.0)
+        for _ in range(10):
+            timeout.record_response_time('fast', 0.1)
+            timeout.record_response_time('slow', 100.0)
+        
+        self.assertEqual(timeout.get_timeout('fast'), 5.0)
+        self.assertEqual(timeout.get_timeout('slow'), 60.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from utils import file_operations
+from utils.file_operations import (_exclude_matcher, find_files, fnmatch_to_regex, manage_flashcards,
+                                   merge_json_files, safe_move_images)
+
+
+class FindFilesTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        for relative_path in ('tmp1', os.path.join('sub', 'tmp2'), os.path.join('.hidden', 'tmp3')):
+            path = os.path.join(self.tmp_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'w').close()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def test_recursive_pattern_skips_hidden_directories(self):
+        found = sorted(os.path.relpath(path, self.tmp_dir) for path in find_files(self.tmp_dir, '**/tmp*'))
+        
+        self.assertEqual(found, ['sub/tmp2', 'tmp1'])
+
+
+
+class ExcludeMatcherTest(unittest.TestCase):
+    
+    PATHS = ['a.tmp', 'a.txt', 'sub/a.tmp', 'sub/deep/b.log', 'x1.log', 'xy.log', 'x/.log',
+             '[ab].txt', 'a.txt.bak', 'keep', 'data/temp', 'data/a/b/temp', 'data/temp/x']
+    
+    CASES = [
+        (['*.tmp'], {'a.tmp'}),
+        (['**/*.tmp'], {'sub/a.tmp'}),
+        (['**.tmp'], {'a.tmp', 'sub/a.tmp'}),
+        (['x?.log'], {'x1.log', 'xy.log'}),
+        (['[ab].txt'], {'[ab].txt'}),
+        (['data/**/temp'], {'data/a/b/temp'}),
+        (['data/**'], {'data/temp', 'data/a/b/temp', 'data/temp/x'}),
+        (['*.txt', 'sub/**', 'keep'], {'a.txt', '[ab].txt', 'sub/a.tmp', 'sub/deep/b.log', 'keep'}),
+    ]
+    
+    def _per_pattern(self, patterns, path):
+        # The per-pattern loop the combined matcher replaced
+        return any(re.compile(fnmatch_to_regex(pattern)).match(path) for pattern in patterns)
+    
+    def test_matches_per_pattern_loop(self):
+        for patterns, expected in self.CASES:
+            is_excluded = _exclude_matcher(patterns)
+            for path in self.PATHS:
+                with self.subTest(patterns=patterns, path=path):
+                    self.assertEqual(is_excluded(path), path in expected)
+                    self.assertEqual(is_excluded(path), self._per_pattern(patterns, path))
+    
+    def test_over_long_pattern_set_falls_back_per_pattern(self):
+        patterns = [f'dir{i}/*.tmp' for i in range(1000)] + ['*.log', '**/b.log']
+        self.assertGreater(sum(len(fnmatch_to_regex(p)) for p in patterns), file_operations._MAX_COMBINED_REGEX_SIZE)
+        
+        is_excluded = _exclude_matcher(patterns)
+        
+        for path in self.PATHS + ['dir999/a.tmp', 'dir999/sub/a.tmp']:
+            with self.subTest(path=path):
+                self.assertEqual(is_excluded(path), self._per_pattern(patterns, path))
+    
+    def test_full_cache_is_cleared_and_rebuilt(self):
+        with mock.patch.object(file_operations, '_PATTERN_CACHE', {}), \
+                mock.patch.object(file_operations, '_PATTERN_CACHE_MAX_ENTRIES', 2):
+            for patterns, expected in self.CASES:
+                self.assertTrue(all(_exclude_matcher(patterns)(path) for path in expected))
+            self.assertLessEqual(len(file_operations._PATTERN_CACHE), 2)
+
+
+class SafeMoveImagesTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.src_dir = os.path.join(self.tmp_dir, 'src')
+        self.dest_dir = os.path.join(self.tmp_dir, 'dest')
+        for relative_path in ('a.PNG', os.path.join('sub', 'b.jpg'), '.c.png', os.path.join('.h', 'i.png')):
+            path = os.path.join(self.src_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'w').close()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def test_moves_images_but_not_hidden_ones(self):
+        moved = safe_move_images(self.src_dir, self.dest_dir)
+        
+        self.assertEqual(sorted(os.path.relpath(path, self.src_dir) for path in moved), ['a.PNG', 'sub/b.jpg'])
+        self.assertTrue(os.path.exists(os.path.join(self.src_dir, '.h', 'i.png')))
+        self.assertTrue(os.path.exists(os.path.join(self.src_dir, '.c.png')))
+
+
+class MergeJsonFilesTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def _write(self, name, text):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+    
+    def test_failed_keyed_merge_keeps_previous_output(self):
+        inputs = [self._write('a.json', '{"items": [1]}'), self._write('b.json', '[2]')]
+        output = self._write('out.json', '{"items": []}')
+        
+        self.assertIsNone(merge_json_files(inputs, output, merge_key='items'))
+        with open(output) as f:
+            self.assertEqual(f.read(), '{"items": []}')
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ['a.json', 'b.json', 'out.json'])
+    
+    def test_keyed_merge_keeps_output_mode(self):
+        inputs = [self._write('a.json', '{"items": [1]}'), self._write('b.json', '{"items": [2]}')]
+        output = self._write('out.json', '{}')
+        os.chmod(output, 0o640)
+        
+        self.assertEqual(merge_json_files(inputs, output, merge_key='items'), output)
+        with open(output) as f:
+            self.assertEqual(json.load(f), {'items': [1, 2]})
+        self.assertEqual(os.stat(output).st_mode & 0o777, 0o640)
+
+
+
+class ManageFlashcardsTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.deck_path = os.path.join(self.tmp_dir, 'deck.json')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def test_save_keeps_deck_mode(self):
+        manage_flashcards(self.deck_path, 'add', cards=[{'id': 'a'}])
+        os.chmod(self.deck_path, 0o600)
+        
+        success, _ = manage_flashcards(self.deck_path, 'add', cards=[{'id': 'b'}])
+        
+        self.assertTrue(success)
+        self.assertEqual(os.stat(self.deck_path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.listdir(self.tmp_dir), ['deck.json'])
+    
+    def test_new_deck_gets_umask_mode(self):
+        old_umask = os.umask(0o027)
+        try:
+            success, _ = manage_flashcards(self.deck_path, 'add', cards=[{'id': 'a'}])
+        finally:
+            os.umask(old_umask)
+        
+        self.assertTrue(success)
+        self.assertEqual(os.stat(self.deck_path).st_mode & 0o777, 0o640)
+    
+    def test_concurrent_saves_leave_a_valid_deck(self):
+        manage_flashcards(self.deck_path, 'add', cards=[{'id': 'seed'}])
+        cards = [[{'id': str(i), 'text': 'x' * 10000}] for i in range(16)]
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda c: manage_flashcards(self.deck_path, 'add', cards=c), cards))
+        
+        self.assertTrue(all(success for success, _ in results))
+        with open(self.deck_path) as f:
+            self.assertIn('seed', [card['id'] for card in json.load(f)['cards']])
+        self.assertEqual(os.listdir(self.tmp_dir), ['deck.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from utils import path_resolver
+from utils.path_resolver import PathResolver, get_project_root, get_resolver
+
+
+class ProjectRootTest(unittest.TestCase):
+    
+    def setUp(self):
+        PathResolver.clear_cache()
+        self.addCleanup(PathResolver.clear_cache)
+    
+    def test_removed_working_directory_does_not_hide_found_root(self):
+        expected = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        
+        with mock.patch.dict(os.environ, {'RECALL_PROJECT_ROOT': ''}), \
+                mock.patch('os.getcwd', side_effect=FileNotFoundError('cwd removed')):
+            self.assertEqual(get_project_root(), expected)
+
+
+
+class PathResolverInstanceTest(unittest.TestCase):
+    
+    def test_constructor_returns_the_shared_resolver(self):
+        resolver = PathResolver()
+        
+        self.assertIsInstance(resolver, PathResolver)
+        self.assertIs(resolver, get_resolver())
+        self.assertEqual(resolver.get_config().project_root, get_project_root())
+    
+    def test_concurrent_first_calls_share_one_instance(self):
+        resolve = PathResolver._resolve_all_paths
+        
+        def slow_resolve(resolver):
+            time.sleep(0.05)
+            return resolve(resolver)
+        
+        with mock.patch.object(path_resolver, '_RESOLVER', None), \
+                mock.patch.object(PathResolver, '_resolve_all_paths', slow_resolve):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                resolvers = list(executor.map(lambda _: PathResolver(), range(8)))
+        
+        self.assertEqual(len({id(resolver) for resolver in resolvers}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+import gc
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+import weakref
+from unittest import mock
+
+from utils import performance_optimizer
+from utils.performance_optimizer import FileCache, _default_cache_key
+
+
+class FileCacheTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = FileCache(os.path.join(self.tmp_dir, 'cache'))
+    
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmp_dir)
+    
+    def test_caches_dict_with_non_str_keys(self):
+        self.cache.cache_result('int_keys', {1: 'int key', 'b': 2})
+        
+        # Keys are coerced to strings, as json.dump does
+        self.assertEqual(self.cache.get_cached_result('int_keys'), {'1': 'int key', 'b': 2})
+    
+    def test_unindexed_payloads_are_removed_on_load(self):
+        self.cache.cache_result('kept', [1])
+        self.cache.close()
+        # A payload whose index row was never flushed, as after a crash
+        orphan = os.path.join(self.tmp_dir, 'cache', 'orphan.json')
+        with open(orphan, 'w') as f:
+            f.write('[2]')
+        
+        self.cache = FileCache(os.path.join(self.tmp_dir, 'cache'))
+        
+        self.assertFalse(os.path.exists(orphan))
+        self.assertEqual(self.cache.get_cached_result('kept'), [1])
+    
+    def test_cache_file_bytes_recovers_from_short_copy_file_range(self):
+        src = os.path.join(self.tmp_dir, 'page.png')
+        with open(src, 'wb') as f:
+            f.write(os.urandom(100000))
+        
+        # As on filesystems where copy_file_range stops early
+        with mock.patch('os.copy_file_range', create=True, return_value=0):
+            self.cache.cache_file_bytes('page', src)
+        
+        cached = self.cache.get_cached_result('page')
+        with open(src, 'rb') as f1, open(cached, 'rb') as f2:
+            self.assertEqual(f1.read(), f2.read())
+    
+    def test_zstd_entry_without_zstandard_is_evicted(self):
+        # An entry written while zstandard was installed
+        with mock.patch.object(performance_optimizer, '_PAYLOAD_ENCODING', 'zstd'), \
+                mock.patch.object(performance_optimizer, '_zstd_compressor', create=True) as compressor:
+            compressor.compress.side_effect = lambda data: data
+            self.cache.cache_result('packed', [1])
+        
+        with mock.patch.object(performance_optimizer, 'zstandard', None), \
+                self.assertLogs(performance_optimizer.logger, 'WARNING') as logs:
+            self.assertIsNone(self.cache.get_cached_result('packed'))
+        
+        self.assertIn('zstandard not installed', logs.output[0])
+        self.assertNotIn('packed', self.cache._cache_index)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, 'cache', 'packed.json.zst')))
+    
+    def test_eviction_keeps_recently_hit_entries(self):
+        for key in ('a', 'b'):
+            self.cache.cache_result(key, 'x' * 100)
+        self.cache.max_size_bytes = self.cache._total_size + 90
+        self.assertIsNotNone(self.cache.get_cached_result('a'))
+        
+        self.cache.cache_result('c', 'x' * 100)
+        
+        self.assertEqual(list(self.cache._cache_index), ['a', 'c'])
+    
+    def test_exit_hook_flushes_pending_index_changes(self):
+        self.cache.cache_result('pending', [1])
+        self.assertIn('pending', self.cache._pending_index)
+        
+        self.cache._flush_at_exit()
+        
+        db = sqlite3.connect(os.path.join(self.tmp_dir, 'cache', 'cache.db'))
+        try:
+            self.assertEqual(db.execute("SELECT key FROM entries").fetchall(), [('pending',)])
+        finally:
+            db.close()
+    
+    def test_exit_hook_does_not_keep_cache_alive(self):
+        cache = FileCache(os.path.join(self.tmp_dir, 'other'))
+        cache_ref = weakref.ref(cache)
+        
+        del cache
+        gc.collect()
+        
+        self.assertIsNone(cache_ref())
+    
+    def test_expired_entries_are_swept_on_lookup(self):
+        with mock.patch('time.time', return_value=1000.0):
+            self.cache.cache_result('short', [1], ttl=10)
+            self.cache.cache_result('long', [2], ttl=100)
+            self.cache.cache_result('forever', [3])
+        
+        with mock.patch('time.time', return_value=1050.0):
+            self.assertEqual(self.cache.get_cached_result('forever'), [3])
+            self.assertEqual(self.cache.get_cached_result('long'), [2])
+        
+        self.assertEqual(sorted(self.cache._cache_index), ['forever', 'long'])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, 'cache', 'short.json')))
+    
+    def test_replaced_entry_is_not_swept_by_its_old_expiry(self):
+        with mock.patch('time.time', return_value=1000.0):
+            self.cache.cache_result('key', [1], ttl=10)
+            self.cache.cache_result('key', [2], ttl=100)
+        
+        with mock.patch('time.time', return_value=1050.0):
+            self.assertEqual(self.cache.get_cached_result('key'), [2])
+        
+        # The stale heap item for the first write was popped without effect
+        self.assertEqual(self.cache._ttl_heap, [(1100.0, 'key')])
+    
+    def test_sweep_is_bounded_per_lookup(self):
+        with mock.patch('time.time', return_value=1000.0):
+            for i in range(20):
+                self.cache.cache_result(f'k{i}', [i], ttl=1)
+        
+        with mock.patch('time.time', return_value=2000.0):
+            self.assertIsNone(self.cache.get_cached_result('missing'))
+            self.assertEqual(len(self.cache._cache_index), 4)
+            self.assertIsNone(self.cache.get_cached_result('missing'))
+        
+        self.assertEqual(len(self.cache._cache_index), 0)
+    
+    def test_touched_source_is_fingerprinted_again_once(self):
+        src = os.path.join(self.tmp_dir, 'page.txt')
+        with open(src, 'w') as f:
+            f.write('text')
+        self.cache.cache_result('quick', [1], file_path=src)
+        self.cache.cache_result('strict', [2], file_path=src, strict=True)
+        st = os.stat(src)
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        
+        quick = mock.patch.object(performance_optimizer, '_quick_fingerprint',
+                                  wraps=performance_optimizer._quick_fingerprint)
+        full = mock.patch.object(self.cache, '_get_file_hash', wraps=self.cache._get_file_hash)
+        with quick as quick_fingerprint, full as get_file_hash:
+            for _ in range(2):
+                self.assertEqual(self.cache.get_cached_result('quick', src), [1])
+                self.assertEqual(self.cache.get_cached_result('strict', src), [2])
+        
+        # Only the first lookups read the content; the new fingerprint is stored
+        self.assertEqual(quick_fingerprint.call_count, 1)
+        self.assertEqual(get_file_hash.call_count, 1)
+        self.assertEqual(self.cache._cache_index['quick'].fingerprint, [4, st.st_mtime_ns + 10 ** 9])
+
+
+class LegacyIndexTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        os.makedirs(self.cache_dir)
+        self.cache = None
+    
+    def tearDown(self):
+        if self.cache is not None:
+            self.cache.close()
+        shutil.rmtree(self.tmp_dir)
+    
+    def _write(self, name, text):
+        with open(os.path.join(self.cache_dir, name), 'w') as f:
+            f.write(text)
+    
+    def test_legacy_json_index_is_imported(self):
+        self._write('kept.json', '[1]')
+        self._write('cache_index.json', json.dumps({'kept': {'timestamp': 1.0, 'size': 3}}))
+        
+        self.cache = FileCache(self.cache_dir)
+        
+        self.assertEqual(self.cache.get_cached_result('kept'), [1])
+        self.assertEqual(self.cache._total_size, 3)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'cache_index.json')))
+    
+    def test_payloads_are_removed_after_failed_import(self):
+        self._write('lost.json', '[1]')
+        self._write('cache_index.json', '{not json')
+        
+        self.cache = FileCache(self.cache_dir)
+        
+        self.assertIsNone(self.cache.get_cached_result('lost'))
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'lost.json')))
+
+
+
+def ocr_page(*args, **kwargs):
+    pass
+
+
+class DefaultCacheKeyTest(unittest.TestCase):
+    
+    KEY_SCRIPT = (
+        "from tests.test_performance_optimizer import ocr_page\n"
+        "from utils.performance_optimizer import _default_cache_key\n"
+        "print(_default_cache_key(ocr_page, ({'alpha', 'beta', 'gamma', 'delta'},), {'pages': frozenset({3, 1})}))"
+    )
+    
+    def test_key_is_stable_across_hash_seeds(self):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        keys = set()
+        for seed in ('1', '2', '3'):
+            result = subprocess.run([sys.executable, '-c', self.KEY_SCRIPT], cwd=backend_dir,
+                                    env=dict(os.environ, PYTHONHASHSEED=seed),
+                                    capture_output=True, text=True, check=True)
+            keys.add(result.stdout.strip())
+        
+        self.assertEqual(len(keys), 1)
+    
+    def test_equal_arguments_give_equal_keys(self):
+        a, b = ['page'], ['page']
+        
+        self.assertEqual(_default_cache_key(ocr_page, (a, a), {}), _default_cache_key(ocr_page, (a, b), {}))
+        self.assertEqual(_default_cache_key(ocr_page, (), {'x': 1, 'y': 2}),
+                         _default_cache_key(ocr_page, (), {'y': 2, 'x': 1}))
+        self.assertNotEqual(_default_cache_key(ocr_page, (1,), {}), _default_cache_key(ocr_page, (2,), {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
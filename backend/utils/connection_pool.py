@@ -10,24 +10,46 @@ This module provides:
 
 import asyncio
 import aiohttp
+import sys
 import time
 import logging
 from typing import Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
+import heapq
 import json
 import threading
 from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 import weakref
+from yarl import URL
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# orjson is an optional, much faster JSON encoder; aiohttp's json_serialize
+# hook expects a str-returning callable
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            # orjson rejects some values json accepts (e.g. ints beyond 64 bits)
+            return json.dumps(obj)
+except ImportError:
+    orjson = None
+    _json_dumps = json.dumps
+
+# dataclass(slots=True) is only available on Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class RequestMetrics:
     """Metrics for tracking request performance."""
     url: str
     method: str
-    start_time: float
+    start_time: float  # time.monotonic() seconds, only meaningful as a difference
     end_time: float = 0.0
     response_size: int = 0
     status_code: int = 0
@@ -41,9 +63,15 @@ class RequestMetrics:
     def success(self) -> bool:
         return 200 <= self.status_code < 300 and self.error is None
 
-@dataclass
+@dataclass(**_SLOTS)
 class ConnectionPoolConfig:
-    """Configuration for connection pool."""
+    """
+    Configuration for connection pool.
+    
+    Request bodies passed as ``json=`` are serialized with orjson when it is
+    installed (stdlib json otherwise); responses can be decoded the same way
+    with ``await response.json(loads=orjson.loads)``.
+    """
     max_connections: int = 100
     max_connections_per_host: int = 30
     connection_timeout: float = 30.0
@@ -52,6 +80,8 @@ class ConnectionPoolConfig:
     enable_compression: bool = True
     max_retries: int = 3
     retry_delay: float = 1.0
+    idle_keepalive_probe: Optional[float] = None  # Seconds between HEAD probes, None disables
+    share_batch_json_bodies: bool = True  # Encode a json= body shared by batched requests once
     
 class AdaptiveTimeout:
     """Adaptive timeout management based on historical performance."""
@@ -61,28 +91,45 @@ class AdaptiveTimeout:
         self.min_timeout = min_timeout
         self.max_timeout = max_timeout
         self._response_times: Dict[str, deque] = defaultdict(lambda: deque(maxlen=50))
-        self._lock = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        # Per-endpoint sample generation, bumped on every recorded response, and
+        # the (generation, timeout) last computed for it
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._cached_timeouts: Dict[str, Tuple[int, float]] = {}
     
     def record_response_time(self, endpoint: str, response_time: float):
         """Record response time for an endpoint."""
-        with self._lock:
-            self._response_times[endpoint].append(response_time)
+        # deque.append is atomic under the GIL, no lock needed on the record path.
+        # Append before bumping the generation so a reader that sees the new
+        # generation also sees the new sample.
+        self._response_times[endpoint].append(response_time)
+        self._generations[endpoint] += 1
     
     def get_timeout(self, endpoint: str) -> float:
         """Get adaptive timeout for an endpoint."""
-        with self._lock:
+        with self._locks[endpoint]:
+            generation = self._generations.get(endpoint, 0)
+            cached = self._cached_timeouts.get(endpoint)
+            if cached is not None and cached[0] == generation:
+                return cached[1]
+            
             times = self._response_times.get(endpoint)
             if not times or len(times) < 5:
                 return self.initial_timeout
             
-            # Calculate timeout based on 95th percentile + buffer
-            sorted_times = sorted(times)
-            p95_index = int(len(sorted_times) * 0.95)
-            p95_time = sorted_times[p95_index]
+            # Snapshot so concurrent appends cannot mutate the deque mid-scan
+            times = list(times)
+            
+            # Calculate timeout based on 95th percentile + buffer; only the top
+            # 5% of samples need ordering, so avoid sorting the whole window
+            p95_index = int(len(times) * 0.95)
+            p95_time = heapq.nlargest(len(times) - p95_index, times)[-1]
             
             # Add 50% buffer and clamp to limits
             adaptive_timeout = p95_time * 1.5
-            return max(self.min_timeout, min(adaptive_timeout, self.max_timeout))
+            timeout = max(self.min_timeout, min(adaptive_timeout, self.max_timeout))
+            self._cached_timeouts[endpoint] = (generation, timeout)
+            return timeout
 
 class RequestBatcher:
     """Batches multiple requests for efficient processing."""
@@ -137,34 +184,38 @@ class RequestBatcher:
             self._pending_requests.clear()
             self._batch_timer = None
         
-        # Group requests by type
-        grouped_requests = defaultdict(list)
+        # Group request data and futures by type in a single pass
+        datas: Dict[str, List[Any]] = {}
+        futures: Dict[str, List[asyncio.Future]] = {}
         for request in batch:
-            grouped_requests[request['type']].append(request)
+            request_type = request['type']
+            datas.setdefault(request_type, []).append(request['data'])
+            futures.setdefault(request_type, []).append(request['future'])
         
         # Process each group
-        for request_type, requests in grouped_requests.items():
+        for request_type, request_datas in datas.items():
+            type_futures = futures[request_type]
             processor = self._batch_processors.get(request_type)
             if processor:
                 try:
-                    results = await processor([req['data'] for req in requests])
+                    results = await processor(request_datas)
                     
                     # Set results for futures
-                    for request, result in zip(requests, results):
-                        if not request['future'].done():
-                            request['future'].set_result(result)
+                    for future, result in zip(type_futures, results):
+                        if not future.done():
+                            future.set_result(result)
                 
                 except Exception as e:
                     # Set exception for all futures in this batch
-                    for request in requests:
-                        if not request['future'].done():
-                            request['future'].set_exception(e)
+                    for future in type_futures:
+                        if not future.done():
+                            future.set_exception(e)
             else:
                 # No processor registered, set error
                 error = f"No batch processor registered for type: {request_type}"
-                for request in requests:
-                    if not request['future'].done():
-                        request['future'].set_exception(ValueError(error))
+                for future in type_futures:
+                    if not future.done():
+                        future.set_exception(ValueError(error))
 
 class OptimizedConnectionPool:
     """Optimized HTTP connection pool with advanced features."""
@@ -172,16 +223,18 @@ class OptimizedConnectionPool:
     def __init__(self, config: ConnectionPoolConfig = None):
         self.config = config or ConnectionPoolConfig()
         self._session: Optional[aiohttp.ClientSession] = None
-        self._metrics: List[RequestMetrics] = []
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._metrics: deque = deque(maxlen=500)  # Recent metrics only
         self._adaptive_timeout = AdaptiveTimeout()
         self._request_batcher = RequestBatcher()
-        self._lock = asyncio.Lock()
         
         # Performance tracking
         self._total_requests = 0
         self._successful_requests = 0
         self._failed_requests = 0
         self._total_bytes_transferred = 0
+        self._sum_success_duration = 0.0
+        self._count_success_duration = 0
         
         # Setup batch processors
         self._setup_batch_processors()
@@ -194,10 +247,13 @@ class OptimizedConnectionPool:
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create the HTTP session."""
         if self._session is None or self._session.closed:
+            # aiohttp sets TCP_NODELAY on every connection itself
+            # (BaseProtocol.connection_made), so the stock connector is enough
             connector = aiohttp.TCPConnector(
                 limit=self.config.max_connections,
                 limit_per_host=self.config.max_connections_per_host,
                 keepalive_timeout=self.config.keepalive_timeout,
+                force_close=False,
                 enable_cleanup_closed=True
             )
             
@@ -209,11 +265,38 @@ class OptimizedConnectionPool:
             self._session = aiohttp.ClientSession(
                 connector=connector,
                 timeout=timeout,
+                json_serialize=_json_dumps,
                 headers={'User-Agent': 'Recall-OptimizedClient/1.0'}
             )
+            
+            if self.config.idle_keepalive_probe and self._keepalive_task is None:
+                self._keepalive_task = asyncio.create_task(self._keepalive_loop())
         
         return self._session
     
+    async def _keepalive_loop(self):
+        """Periodically probe recently used hosts so idle pooled connections stay warm."""
+        while True:
+            await asyncio.sleep(self.config.idle_keepalive_probe)
+            
+            session = self._session
+            if session is None or session.closed:
+                continue
+            
+            # Origins seen in recent metrics; probes are not recorded as requests
+            origins = set()
+            for metrics in self._metrics:
+                parts = urlsplit(metrics.url)
+                if parts.scheme and parts.netloc:
+                    origins.add(f"{parts.scheme}://{parts.netloc}/")
+            
+            for origin in origins:
+                try:
+                    async with session.head(origin, allow_redirects=False):
+                        pass
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.debug(f"Keepalive probe to {origin} failed: {e}")
+    
     async def request(self, method: str, url: str, 
                      batch: bool = False, 
                      adaptive_timeout: bool = True,
@@ -255,7 +338,7 @@ class OptimizedConnectionPool:
         metrics = RequestMetrics(
             url=url,
             method=method,
-            start_time=time.time()
+            start_time=time.monotonic()
         )
         
         try:
@@ -263,7 +346,7 @@ class OptimizedConnectionPool:
             response = await self._make_request_with_retries(session, method, url, **kwargs)
             
             # Update metrics
-            metrics.end_time = time.time()
+            metrics.end_time = time.monotonic()
             metrics.status_code = response.status
             metrics.response_size = int(response.headers.get('content-length', 0))
             
@@ -275,26 +358,24 @@ class OptimizedConnectionPool:
             self._total_requests += 1
             if metrics.success:
                 self._successful_requests += 1
+                if metrics.duration > 0:
+                    self._sum_success_duration += metrics.duration
+                    self._count_success_duration += 1
             else:
                 self._failed_requests += 1
             
             self._total_bytes_transferred += metrics.response_size
             
-            # Store metrics
-            async with self._lock:
-                self._metrics.append(metrics)
-                # Keep only recent metrics
-                if len(self._metrics) > 1000:
-                    self._metrics = self._metrics[-500:]
+            # Store metrics (single event loop, append cannot interleave)
+            self._metrics.append(metrics)
             
             return response
         
         except Exception as e:
-            metrics.end_time = time.time()
+            metrics.end_time = time.monotonic()
             metrics.error = str(e)
             
-            async with self._lock:
-                self._metrics.append(metrics)
+            self._metrics.append(metrics)
             
             self._total_requests += 1
             self._failed_requests += 1
@@ -306,9 +387,16 @@ class OptimizedConnectionPool:
         """Make request with retry logic."""
         last_exception = None
         
+        # Parse the URL once; aiohttp uses a URL object as-is on every attempt.
+        # An unparsable URL raises InvalidURL, as session.request would
+        try:
+            request_url = URL(url)
+        except ValueError as e:
+            raise aiohttp.InvalidURL(url) from e
+        
         for attempt in range(self.config.max_retries + 1):
             try:
-                response = await session.request(method, url, **kwargs)
+                response = await session.request(method, request_url, **kwargs)
                 
                 # Check if we should retry based on status code
                 if response.status >= 500 and attempt < self.config.max_retries:
@@ -327,11 +415,44 @@ class OptimizedConnectionPool:
         
         raise last_exception or Exception("Max retries exceeded")
     
+    def _batch_request_kwargs(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Build per-request kwargs for a batch, encoding shared JSON bodies once.
+        
+        Requests that pass the same ``json=`` object (e.g. one payload broadcast
+        to several endpoints) get a single pre-encoded ``data=`` body instead of
+        being serialized again by aiohttp for every request.
+        """
+        if not self.config.share_batch_json_bodies:
+            return [request['kwargs'] for request in requests]
+        
+        encoded_bodies: Dict[int, bytes] = {}
+        batch_kwargs = []
+        for request in requests:
+            kwargs = request['kwargs']
+            body = kwargs.get('json')
+            if body is not None and 'data' not in kwargs:
+                body_id = id(body)
+                if body_id not in encoded_bodies:
+                    encoded_bodies[body_id] = _json_dumps(body).encode('utf-8')
+                
+                kwargs = dict(kwargs)
+                del kwargs['json']
+                kwargs['data'] = encoded_bodies[body_id]
+                headers = dict(kwargs.get('headers') or {})
+                if not any(name.lower() == 'content-type' for name in headers):
+                    headers['Content-Type'] = 'application/json'
+                kwargs['headers'] = headers
+            
+            batch_kwargs.append(kwargs)
+        
+        return batch_kwargs
+    
     async def _batch_get_processor(self, requests: List[Dict[str, Any]]) -> List[Any]:
         """Process a batch of GET requests."""
         tasks = []
-        for request in requests:
-            task = self._make_request('GET', request['url'], False, **request['kwargs'])
+        for request, kwargs in zip(requests, self._batch_request_kwargs(requests)):
+            task = self._make_request('GET', request['url'], False, **kwargs)
             tasks.append(task)
         
         return await asyncio.gather(*tasks, return_exceptions=True)
@@ -339,8 +460,8 @@ class OptimizedConnectionPool:
     async def _batch_post_processor(self, requests: List[Dict[str, Any]]) -> List[Any]:
         """Process a batch of POST requests."""
         tasks = []
-        for request in requests:
-            task = self._make_request('POST', request['url'], False, **request['kwargs'])
+        for request, kwargs in zip(requests, self._batch_request_kwargs(requests)):
+            task = self._make_request('POST', request['url'], False, **kwargs)
             tasks.append(task)
         
         return await asyncio.gather(*tasks, return_exceptions=True)
@@ -365,9 +486,9 @@ class OptimizedConnectionPool:
         """Get performance statistics."""
         success_rate = (self._successful_requests / self._total_requests * 100) if self._total_requests > 0 else 0
         
-        # Calculate average response time
-        recent_metrics = [m for m in self._metrics if m.success and m.duration > 0]
-        avg_response_time = sum(m.duration for m in recent_metrics) / len(recent_metrics) if recent_metrics else 0
+        # Average response time from running totals kept by _make_request
+        avg_response_time = (self._sum_success_duration / self._count_success_duration
+                             if self._count_success_duration else 0)
         
         return {
             'total_requests': self._total_requests,
@@ -381,6 +502,10 @@ class OptimizedConnectionPool:
     
     async def close(self):
         """Close the connection pool."""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        
         if self._session and not self._session.closed:
             await self._session.close()
 
@@ -406,7 +531,7 @@ class NetworkOptimizer:
     def record_network_stats(self, requests_count: int, bytes_transferred: int, errors: int):
         """Record network statistics."""
         with self._stats_lock:
-            current_time = time.time()
+            current_time = time.monotonic()  # only compared with other samples
             
             self._global_stats['requests_per_second'].append((current_time, requests_count))
             self._global_stats['bandwidth_usage'].append((current_time, bytes_transferred))
@@ -415,19 +540,18 @@ class NetworkOptimizer:
     def get_network_health(self) -> Dict[str, Any]:
         """Get overall network health metrics."""
         with self._stats_lock:
-            current_time = time.time()
+            current_time = time.monotonic()
             
-            # Calculate metrics for the last minute
-            recent_requests = [count for timestamp, count in self._global_stats['requests_per_second'] 
-                             if current_time - timestamp <= 60]
-            recent_bandwidth = [bytes_val for timestamp, bytes_val in self._global_stats['bandwidth_usage'] 
-                              if current_time - timestamp <= 60]
-            recent_errors = [errors for timestamp, errors in self._global_stats['error_rate'] 
-                           if current_time - timestamp <= 60]
+            # Entries are appended in (monotonic) time order, so anything older
+            # than the last minute sits at the left end and can be dropped in place
+            for samples in self._global_stats.values():
+                while samples and current_time - samples[0][0] > 60:
+                    samples.popleft()
             
-            total_requests = sum(recent_requests)
-            total_bandwidth = sum(recent_bandwidth)
-            total_errors = sum(recent_errors)
+            # Calculate metrics for the last minute
+            total_requests = sum(count for _, count in self._global_stats['requests_per_second'])
+            total_bandwidth = sum(bytes_val for _, bytes_val in self._global_stats['bandwidth_usage'])
+            total_errors = sum(errors for _, errors in self._global_stats['error_rate'])
             
             error_rate = (total_errors / total_requests * 100) if total_requests > 0 else 0
             
@@ -1,10 +1,34 @@
 import os
 import logging
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from utils.file_operations import ensure_dir
 
 logger = logging.getLogger(__name__)
 
+def _migrate_deck(source_path, dest_path):
+    """
+    Migrate a single deck file.
+    
+    Returns:
+        int: 1 if the deck was migrated, 0 if it was skipped or failed
+    """
+    filename = os.path.basename(dest_path)
+    
+    # Skip if the file already exists in the root decks directory
+    if os.path.exists(dest_path):
+        logger.info(f"Deck {filename} already exists in root directory, skipping migration.")
+        return 0
+        
+    try:
+        # Copy the deck file
+        shutil.copy2(source_path, dest_path)
+        logger.info(f"Migrated deck {filename} from {os.path.dirname(source_path)} to {os.path.dirname(dest_path)}")
+        return 1
+    except Exception as e:
+        logger.error(f"Error migrating deck {filename}: {str(e)}")
+        return 0
+
 def migrate_decks_from_build(root_decks_dir):
     """
     Checks for decks in build directories and migrates them to the root decks directory.
@@ -28,10 +52,13 @@ def migrate_decks_from_build(root_decks_dir):
         
     # Find all deck directories in build subfolders
     build_deck_dirs = []
-    for subdir in os.listdir(build_dir):
-        potential_deck_dir = os.path.join(build_dir, subdir, 'decks')
-        if os.path.exists(potential_deck_dir) and os.path.isdir(potential_deck_dir):
-            build_deck_dirs.append(potential_deck_dir)
+    with os.scandir(build_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            potential_deck_dir = os.path.join(entry.path, 'decks')
+            if os.path.isdir(potential_deck_dir):
+                build_deck_dirs.append(potential_deck_dir)
     
     if not build_deck_dirs:
         logger.info("No deck directories found in build folders.")
@@ -40,33 +67,31 @@ def migrate_decks_from_build(root_decks_dir):
     # Ensure the root decks directory exists
     ensure_dir(root_decks_dir)
     
-    # Count migrated files
-    migrated_count = 0
-    
-    # Check each build deck directory
+    # Collect (source, destination) pairs; the first build directory to
+    # provide a given deck name wins, as with the previous serial copy
+    pending = {}
     for build_deck_dir in build_deck_dirs:
-        if not os.path.exists(build_deck_dir) or not os.path.isdir(build_deck_dir):
+        try:
+            entries = list(os.scandir(build_deck_dir))
+        except OSError as e:
+            logger.error(f"Error scanning deck directory {build_deck_dir}: {str(e)}")
             continue
             
         # Find all JSON deck files
-        for filename in os.listdir(build_deck_dir):
-            if filename.endswith('.json'):
-                source_path = os.path.join(build_deck_dir, filename)
-                dest_path = os.path.join(root_decks_dir, filename)
-                
-                # Skip if the file already exists in the root decks directory
-                if os.path.exists(dest_path):
-                    logger.info(f"Deck {filename} already exists in root directory, skipping migration.")
+        for entry in entries:
+            filename = entry.name
+            if filename.endswith('.json') and entry.is_file():
+                if filename in pending:
+                    logger.info(f"Deck {filename} already queued from another build directory, skipping.")
                     continue
-                    
-                try:
-                    # Copy the deck file
-                    shutil.copy2(source_path, dest_path)
-                    migrated_count += 1
-                    
-                    logger.info(f"Migrated deck {filename} from {build_deck_dir} to {root_decks_dir}")
-                except Exception as e:
-                    logger.error(f"Error migrating deck {filename}: {str(e)}")
+                pending[filename] = (entry.path, os.path.join(root_decks_dir, filename))
+    
+    # Copies are syscall-latency bound, so overlap them in a small thread pool
+    migrated_count = 0
+    if pending:
+        max_workers = min(16, (os.cpu_count() or 1) * 4, len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            migrated_count = sum(executor.map(lambda pair: _migrate_deck(*pair), pending.values()))
     
     if migrated_count > 0:
         logger.info(f"Successfully migrated {migrated_count} deck(s) from build directories.")
@@ -14,18 +14,85 @@ import os
 import shutil
 import logging
 import re
+import functools
 import json
 import fnmatch
 import uuid
+import mmap
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Set, Optional, Tuple, Union, Callable
+from typing import Any, Iterator, List, Dict, Set, Optional, Tuple, Union, Callable
 import glob
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
-def delete_dir(directory: str, exclude: Optional[List[str]] = None) -> bool:
+# Prefer orjson for deck files when available; it reads and writes bytes
+# directly and is several times faster than the stdlib json module
+try:
+    import orjson
+    
+    def _load_json(file_path: str) -> Any:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    
+    def _dump_json(data: Any, file_path: str, fsync: bool = False) -> None:
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+except ImportError:
+    orjson = None
+    
+    def _load_json(file_path: str) -> Any:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _dump_json(data: Any, file_path: str, fsync: bool = False) -> None:
+        # Serialize first and write once; json.dump issues a write per token
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, indent=2, ensure_ascii=False))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+# Matches "**/*.ext" and "**/*.{ext1,ext2,...}" find_files patterns
+_EXTENSION_PATTERN = re.compile(r'^\*\*/\*\.(?:(\w+)|\{(\w+(?:,\w+)*)\})$')
+
+# Deck files at least this large are memory-mapped for read-only loads
+_MMAP_MIN_SIZE = 1024 * 1024
+
+def _load_json_readonly(file_path: str) -> Any:
+    """
+    Load a JSON file that will not be written back.
+    
+    Large files are memory-mapped and parsed by orjson straight from the
+    mapping, avoiding a read() copy of the whole file; otherwise this is
+    _load_json.
+    """
+    if orjson is None or os.path.getsize(file_path) < _MMAP_MIN_SIZE:
+        return _load_json(file_path)
+    
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            return orjson.loads(view)
+
+# Write buffer for deck export files, so large exports reach the OS in big writes
+_EXPORT_BUFFER_SIZE = 1 << 20
+
+def _remove_file(file_path: str) -> None:
+    """Delete a single file, logging (not raising) on failure."""
+    try:
+        os.remove(file_path)
+        logger.debug("Deleted file: %s", file_path)
+    except Exception as e:
+        logger.error("Error deleting file %s: %s", file_path, e)
+
+def delete_dir(directory: str, exclude: Optional[List[str]] = None, workers: int = 1) -> bool:
     """
     Recursively delete a directory and its contents, with optional exclusions.
     
@@ -33,73 +100,114 @@ def delete_dir(directory: str, exclude: Optional[List[str]] = None) -> bool:
         directory (str): Path to the directory to delete
         exclude (Optional[List[str]]): List of file/directory patterns to exclude from deletion.
             Can include glob patterns like '*.jpg' or '*/images/*'
+        workers (int): Number of threads used to delete the files of each directory
+            (capped at 32). With more than one worker the order of the per-file
+            log messages is no longer guaranteed. Ignored when nothing is excluded,
+            since the whole tree is then removed with shutil.rmtree.
     
     Returns:
         bool: True if deletion was successful, False otherwise
     """
     if not os.path.exists(directory):
-        logger.warning(f"Directory does not exist: {directory}")
+        logger.warning("Directory does not exist: %s", directory)
         return True  # Consider non-existence as successful deletion
         
     if not os.path.isdir(directory):
-        logger.error(f"Path is not a directory: {directory}")
+        logger.error("Path is not a directory: %s", directory)
         return False
         
-    exclude_patterns = exclude if exclude is not None else []
+    # Nothing to keep: let shutil.rmtree do the whole job
+    if not exclude:
+        try:
+            shutil.rmtree(directory)
+            logger.info("Deleted root directory: %s", directory)
+            return True
+        except Exception as e:
+            logger.error("Error during directory deletion %s: %s", directory, e)
+            return False
+        
+    exclude_patterns = exclude
+    workers = max(1, min(workers, 32))
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
     
     try:
-        # Compile exclude patterns for more efficient matching
-        compiled_patterns = [re.compile(fnmatch_to_regex(pattern)) for pattern in exclude_patterns]
+        # Build a single matcher for all exclude patterns
+        is_excluded = _exclude_matcher(exclude_patterns)
+        
+        # Paths yielded by os.walk all start with this prefix, so relative
+        # paths can be sliced off instead of computed with os.path.relpath
+        base_len = len(os.path.join(directory, ''))
         
         # Walk through directory bottom-up so we delete files before their parent directories
         for root, dirs, files in os.walk(directory, topdown=False):
+            # Join once per directory; plain concatenation in the loops below
+            root_prefix = os.path.join(root, '')
+            
             # Process files
+            file_paths = []
             for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, directory)
+                file_path = root_prefix + file
+                rel_path = file_path[base_len:]
                 
                 # Skip excluded files
-                if any(pattern.match(rel_path) for pattern in compiled_patterns):
-                    logger.debug(f"Skipping excluded file: {rel_path}")
+                if is_excluded(rel_path):
+                    logger.debug("Skipping excluded file: %s", rel_path)
                     continue
-                    
-                try:
-                    os.remove(file_path)
-                    logger.debug(f"Deleted file: {file_path}")
-                except Exception as e:
-                    logger.error(f"Error deleting file {file_path}: {e}")
+                
+                file_paths.append(file_path)
+            
+            # Files of this directory must be gone before its parent is checked,
+            # so wait for the whole batch before moving on
+            if executor is not None and len(file_paths) > 1:
+                list(executor.map(_remove_file, file_paths))
+            else:
+                for file_path in file_paths:
+                    _remove_file(file_path)
                     
             # Process directories
             for dir_name in dirs:
-                dir_path = os.path.join(root, dir_name)
-                rel_path = os.path.relpath(dir_path, directory)
+                dir_path = root_prefix + dir_name
+                rel_path = dir_path[base_len:]
                 
                 # Skip excluded directories
-                if any(pattern.match(rel_path) for pattern in compiled_patterns):
-                    logger.debug(f"Skipping excluded directory: {rel_path}")
+                if is_excluded(rel_path):
+                    logger.debug("Skipping excluded directory: %s", rel_path)
                     continue
                     
                 # Check if directory is empty
                 if not os.listdir(dir_path):
                     try:
                         os.rmdir(dir_path)
-                        logger.debug(f"Deleted directory: {dir_path}")
+                        logger.debug("Deleted directory: %s", dir_path)
                     except Exception as e:
-                        logger.error(f"Error deleting directory {dir_path}: {e}")
+                        logger.error("Error deleting directory %s: %s", dir_path, e)
         
         # Finally, try to remove the root directory if it's now empty
         if os.path.exists(directory) and not os.listdir(directory):
             os.rmdir(directory)
-            logger.info(f"Deleted root directory: {directory}")
+            logger.info("Deleted root directory: %s", directory)
         elif os.path.exists(directory):
-            logger.info(f"Root directory not empty, some files/dirs were excluded: {directory}")
+            logger.info("Root directory not empty, some files/dirs were excluded: %s", directory)
             
         return True
         
     except Exception as e:
-        logger.error(f"Error during directory deletion {directory}: {e}")
+        logger.error("Error during directory deletion %s: %s", directory, e)
         return False
+    
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+# Escaped wildcard tokens and their regex translations for fnmatch_to_regex
+_WILDCARD_TOKENS = re.compile(r'\\\*\\\*|\\\*|\\\?')
+_WILDCARD_REGEX = {
+    '\\*\\*': '.*',           # ** matches any directory depth
+    '\\*': '[^/\\\\]*',      # * matches any character except directory separator
+    '\\?': '[^/\\\\]',       # ? matches a single character except directory separator
+}
 
+@functools.lru_cache(maxsize=512)
 def fnmatch_to_regex(pattern: str) -> str:
     """
     Convert a shell-style wildcard pattern to a regular expression pattern.
@@ -110,20 +218,57 @@ def fnmatch_to_regex(pattern: str) -> str:
     Returns:
         str: Regular expression pattern
     """
-    # Escape all special regex characters except * and ?
-    regex = re.escape(pattern)
+    # Escape all special regex characters, then translate the escaped
+    # wildcards back in a single pass
+    regex = _WILDCARD_TOKENS.sub(lambda m: _WILDCARD_REGEX[m.group(0)], re.escape(pattern))
     
-    # Convert ** to match any directory depth
-    regex = regex.replace('\\*\\*', '.*')
+    # Ensure pattern matches from the beginning to the end of the string
+    return f'^{regex}$'
+
+# Above this size a combined alternation is split back into per-pattern regexes
+_MAX_COMBINED_REGEX_SIZE = 20000
+
+# Exclude matchers keyed by their pattern tuple, kept for the process lifetime
+# so repeated cleanups with the same patterns skip translation and compilation
+# (re's own cache is small and shared with every other regex in the process)
+_PATTERN_CACHE: Dict[Tuple[str, ...], Callable[[str], bool]] = {}
+_PATTERN_CACHE_MAX_ENTRIES = 256
+
+def _exclude_matcher(patterns: List[str]) -> Callable[[str], bool]:
+    """
+    Build a predicate that tells whether a relative path matches any exclude pattern.
+    
+    All patterns are joined into one anchored alternation so each path is
+    matched once instead of once per pattern. Very large pattern sets fall
+    back to matching the individually compiled patterns.
     
-    # Convert * to match any character except directory separator
-    regex = regex.replace('\\*', '[^/\\\\]*')
+    Args:
+        patterns (List[str]): Shell-style exclude patterns
+        
+    Returns:
+        Callable[[str], bool]: Predicate returning True for excluded paths
+    """
+    if not patterns:
+        return lambda path: False
     
-    # Convert ? to match a single character except directory separator
-    regex = regex.replace('\\?', '[^/\\\\]')
+    key = tuple(patterns)
+    matcher = _PATTERN_CACHE.get(key)
+    if matcher is None:
+        if len(_PATTERN_CACHE) >= _PATTERN_CACHE_MAX_ENTRIES:
+            _PATTERN_CACHE.clear()
+        matcher = _PATTERN_CACHE[key] = _build_exclude_matcher(key)
+    return matcher
+
+def _build_exclude_matcher(patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    """Compile the predicate for _exclude_matcher (uncached)."""
+    # fnmatch_to_regex anchors with ^...$; strip those to build the alternation
+    combined = "^(?:" + "|".join(f"(?:{fnmatch_to_regex(p)[1:-1]})" for p in patterns) + ")$"
+    if len(combined) <= _MAX_COMBINED_REGEX_SIZE:
+        match = re.compile(combined).match
+        return lambda path: match(path) is not None
     
-    # Ensure pattern matches from the beginning to the end of the string
-    return f'^{regex}$'
+    compiled_patterns = [re.compile(fnmatch_to_regex(pattern)) for pattern in patterns]
+    return lambda path: any(pattern.match(path) for pattern in compiled_patterns)
 
 def copy_file(src: str, dst: str, preserve_metadata: bool = True) -> bool:
     """
@@ -138,7 +283,7 @@ def copy_file(src: str, dst: str, preserve_metadata: bool = True) -> bool:
         bool: True if successful, False otherwise
     """
     if not os.path.exists(src):
-        logger.error(f"Source file does not exist: {src}")
+        logger.error("Source file does not exist: %s", src)
         return False
         
     try:
@@ -152,11 +297,11 @@ def copy_file(src: str, dst: str, preserve_metadata: bool = True) -> bool:
         else:
             shutil.copy(src, dst)   # copy doesn't preserve metadata
             
-        logger.debug(f"Copied file from {src} to {dst}")
+        logger.debug("Copied file from %s to %s", src, dst)
         return True
         
     except Exception as e:
-        logger.error(f"Error copying file from {src} to {dst}: {e}")
+        logger.error("Error copying file from %s to %s: %s", src, dst, e)
         return False
 
 def find_files(base_dir: str, pattern: str) -> List[str]:
@@ -171,27 +316,92 @@ def find_files(base_dir: str, pattern: str) -> List[str]:
         List[str]: List of matching file paths (absolute)
     """
     if not os.path.exists(base_dir) or not os.path.isdir(base_dir):
-        logger.error(f"Base directory invalid or doesn't exist: {base_dir}")
+        logger.error("Base directory invalid or doesn't exist: %s", base_dir)
         return []
         
     try:
-        # Use glob for pattern matching
-        if '**' in pattern:
-            # Python 3.5+ supports recursive glob with **
-            return glob.glob(os.path.join(base_dir, pattern), recursive=True)
-        else:
-            return glob.glob(os.path.join(base_dir, pattern))
+        return list(_iter_files(base_dir, pattern))
             
     except Exception as e:
-        logger.error(f"Error searching for files in {base_dir} with pattern {pattern}: {e}")
+        logger.error("Error searching for files in %s with pattern %s: %s", base_dir, pattern, e)
         return []
 
-def get_dir_size(directory: str) -> int:
+def _iter_files(base_dir: str, pattern: str) -> Iterator[str]:
+    """Lazily yield paths under base_dir matching pattern (see find_files)."""
+    # Fast path for recursive extension patterns (also supports the
+    # {a,b,c} alternation that glob does not understand)
+    extension_match = _EXTENSION_PATTERN.match(pattern)
+    if extension_match:
+        extensions = extension_match.group(1) or extension_match.group(2)
+        return _scan_by_extensions(base_dir, frozenset(extensions.split(',')))
+    
+    # Use glob for pattern matching. Recursive patterns stay on glob rather
+    # than Path.rglob: glob skips hidden files and directories, which
+    # cleanup_processing_dir relies on to leave .git/.venv alone
+    if '**' in pattern:
+        # Python 3.5+ supports recursive glob with **
+        return glob.iglob(os.path.join(base_dir, pattern), recursive=True)
+    else:
+        return glob.iglob(os.path.join(base_dir, pattern))
+
+def _scan_by_extensions(base_dir: str, extensions: Set[str]) -> Iterator[str]:
+    """
+    Recursively yield files under base_dir whose extension is in extensions.
+    
+    Equivalent to glob's "**/*.ext" (hidden files and directories are skipped)
+    but walks the tree once with os.scandir and checks each name against the
+    extension set instead of running fnmatch per directory.
+    """
+    stack = [base_dir]
+    
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    elif entry.name.rpartition('.')[2] in extensions and '.' in entry.name:
+                        yield entry.path
+        except OSError as e:
+            logger.warning("Could not scan %s: %s", current, e)
+
+def _scan_tree_size(directory: str) -> int:
+    """
+    Sum the sizes of regular files under a directory, skipping symlinks.
+    
+    Uses os.scandir so file type checks come from the directory listing
+    itself, and an explicit stack instead of recursion for deep trees.
+    """
+    total_size = 0
+    stack = [directory]
+    
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError as e:
+            logger.debug("Could not scan directory %s: %s", current, e)
+    
+    return total_size
+
+def get_dir_size(directory: str, workers: int = 1) -> int:
     """
     Calculate total size of a directory in bytes.
     
     Args:
         directory (str): Directory path
+        workers (int): Number of threads used to scan top-level subdirectories.
+            Parallel scanning only kicks in when there are more than 4 of them.
     
     Returns:
         int: Total size in bytes
@@ -199,20 +409,35 @@ def get_dir_size(directory: str) -> int:
     total_size = 0
     
     if not os.path.exists(directory) or not os.path.isdir(directory):
-        logger.warning(f"Directory does not exist or is not a directory: {directory}")
+        logger.warning("Directory does not exist or is not a directory: %s", directory)
         return 0
         
     try:
-        for dirpath, dirnames, filenames in os.walk(directory):
-            for filename in filenames:
-                file_path = os.path.join(dirpath, filename)
-                if os.path.isfile(file_path) and not os.path.islink(file_path):
-                    total_size += os.path.getsize(file_path)
-                    
+        if workers <= 1:
+            return _scan_tree_size(directory)
+        
+        # Size files at the root directly and collect subtrees to fan out
+        subdirs = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_symlink():
+                    continue
+                if entry.is_file(follow_symlinks=False):
+                    total_size += entry.stat(follow_symlinks=False).st_size
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+        
+        # Thread start-up is not worth it for a handful of subtrees
+        if len(subdirs) > 4:
+            with ThreadPoolExecutor(max_workers=min(workers, len(subdirs))) as executor:
+                total_size += sum(executor.map(_scan_tree_size, subdirs))
+        else:
+            total_size += sum(_scan_tree_size(subdir) for subdir in subdirs)
+        
         return total_size
         
     except Exception as e:
-        logger.error(f"Error calculating directory size for {directory}: {e}")
+        logger.error("Error calculating directory size for %s: %s", directory, e)
         return 0
 
 def ensure_dir(directory: str) -> bool:
@@ -229,15 +454,15 @@ def ensure_dir(directory: str) -> bool:
         if os.path.isdir(directory):
             return True
         else:
-            logger.error(f"Path exists but is not a directory: {directory}")
+            logger.error("Path exists but is not a directory: %s", directory)
             return False
             
     try:
         os.makedirs(directory, exist_ok=True)
-        logger.debug(f"Created directory: {directory}")
+        logger.debug("Created directory: %s", directory)
         return True
     except Exception as e:
-        logger.error(f"Failed to create directory {directory}: {e}")
+        logger.error("Failed to create directory %s: %s", directory, e)
         return False
 
 def list_subdirs(directory: str, include_hidden: bool = False) -> List[str]:
@@ -252,7 +477,7 @@ def list_subdirs(directory: str, include_hidden: bool = False) -> List[str]:
         List[str]: List of subdirectory names (not full paths)
     """
     if not os.path.exists(directory) or not os.path.isdir(directory):
-        logger.warning(f"Directory does not exist: {directory}")
+        logger.warning("Directory does not exist: %s", directory)
         return []
         
     try:
@@ -265,7 +490,7 @@ def list_subdirs(directory: str, include_hidden: bool = False) -> List[str]:
         return subdirs
         
     except Exception as e:
-        logger.error(f"Error listing subdirectories in {directory}: {e}")
+        logger.error("Error listing subdirectories in %s: %s", directory, e)
         return []
 
 def backup_file(file_path: str, backup_suffix: str = '.bak') -> Optional[str]:
@@ -280,17 +505,17 @@ def backup_file(file_path: str, backup_suffix: str = '.bak') -> Optional[str]:
         Optional[str]: Path to the backup file if successful, None otherwise
     """
     if not os.path.exists(file_path) or not os.path.isfile(file_path):
-        logger.error(f"File does not exist: {file_path}")
+        logger.error("File does not exist: %s", file_path)
         return None
         
     backup_path = f"{file_path}{backup_suffix}"
     
     try:
         shutil.copy2(file_path, backup_path)
-        logger.debug(f"Created backup of {file_path} at {backup_path}")
+        logger.debug("Created backup of %s at %s", file_path, backup_path)
         return backup_path
     except Exception as e:
-        logger.error(f"Error creating backup of {file_path}: {e}")
+        logger.error("Error creating backup of %s: %s", file_path, e)
         return None
 
 def print_dir_tree(directory: str, max_depth: int = 3) -> None:
@@ -302,35 +527,40 @@ def print_dir_tree(directory: str, max_depth: int = 3) -> None:
         max_depth (int): Maximum depth to traverse
     """
     if not os.path.exists(directory) or not os.path.isdir(directory):
-        logger.warning(f"Directory does not exist: {directory}")
+        logger.warning("Directory does not exist: %s", directory)
         return
     
-    def _print_tree(dir_path: str, prefix: str = '', depth: int = 0):
-        if depth > max_depth:
-            print(f"{prefix}├── ...")
-            return
-            
-        contents = sorted(os.listdir(dir_path))
-        count = len(contents)
+    def _sorted_entries(dir_path: str) -> List[os.DirEntry]:
+        with os.scandir(dir_path) as entries:
+            return sorted(entries, key=lambda entry: entry.name)
+    
+    print(os.path.basename(directory) or directory)
+    
+    # Explicit stack of (entries, next index, prefix, depth) instead of recursion;
+    # a directory's remaining siblings are pushed before its first child
+    stack = [(_sorted_entries(directory), 0, '', 0)]
+    while stack:
+        entries, index, prefix, depth = stack.pop()
+        if index >= len(entries):
+            continue
         
-        for i, item in enumerate(contents):
-            is_last = i == count - 1
-            item_path = os.path.join(dir_path, item)
+        entry = entries[index]
+        stack.append((entries, index + 1, prefix, depth))
+        
+        # Print item with appropriate prefix
+        if index == len(entries) - 1:
+            print(f"{prefix}└── {entry.name}")
+            new_prefix = prefix + "    "
+        else:
+            print(f"{prefix}├── {entry.name}")
+            new_prefix = prefix + "│   "
             
-            # Print item with appropriate prefix
-            if is_last:
-                print(f"{prefix}└── {item}")
-                new_prefix = prefix + "    "
+        # Descend into subdirectories (DirEntry caches the type, no extra stat)
+        if entry.is_dir(follow_symlinks=False):
+            if depth + 1 > max_depth:
+                print(f"{new_prefix}├── ...")
             else:
-                print(f"{prefix}├── {item}")
-                new_prefix = prefix + "│   "
-                
-            # Recursively print subdirectories
-            if os.path.isdir(item_path):
-                _print_tree(item_path, new_prefix, depth + 1)
-    
-    print(os.path.basename(directory) or directory)
-    _print_tree(directory)
+                stack.append((_sorted_entries(entry.path), 0, new_prefix, depth + 1))
 
 # Additional functions specific to the Recall application
 
@@ -350,46 +580,62 @@ def safe_move_images(src_dir: str, dest_dir: str, extensions: Optional[List[str]
         extensions = ['.png', '.jpg', '.jpeg']
         
     if not os.path.exists(src_dir) or not os.path.isdir(src_dir):
-        logger.error(f"Source directory does not exist: {src_dir}")
+        logger.error("Source directory does not exist: %s", src_dir)
         return {}
         
     ensure_dir(dest_dir)
     path_mapping = {}
     
     try:
-        # Find all image files
-        for ext in extensions:
-            image_files = find_files(src_dir, f"**/*{ext}")
+        # Find all image files in a single walk, matching extensions case-insensitively.
+        # Collect first so moves never affect the walk itself.
+        image_exts = {ext.lower() for ext in extensions}
+        image_files = []
+        for root, dirs, files in os.walk(src_dir):
+            # Skip hidden directories and files, as the previous glob did
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            root_prefix = os.path.join(root, '')
+            for file in files:
+                if not file.startswith('.') and os.path.splitext(file)[1].lower() in image_exts:
+                    image_files.append(root_prefix + file)
+        
+        # Walked paths all start with src_dir, so relative paths are slices
+        src_len = len(os.path.join(src_dir, ''))
+        dest_prefix = os.path.join(dest_dir, '')
+        
+        # Destination directories already ensured, so each is checked only once
+        known_dirs = {dest_dir}
+        
+        for src_path in image_files:
+            # Determine relative path to maintain directory structure
+            dest_path = dest_prefix + src_path[src_len:]
             
-            for src_path in image_files:
-                # Determine relative path to maintain directory structure
-                rel_path = os.path.relpath(src_path, src_dir)
-                dest_path = os.path.join(dest_dir, rel_path)
-                
-                # Create destination directory if needed
-                dest_dir_path = os.path.dirname(dest_path)
+            # Create destination directory if needed
+            dest_dir_path = os.path.dirname(dest_path)
+            if dest_dir_path not in known_dirs:
                 ensure_dir(dest_dir_path)
+                known_dirs.add(dest_dir_path)
+            
+            # Move file
+            try:
+                # Create backup before moving
+                backup_path = None
+                if os.path.exists(dest_path):
+                    backup_path = backup_file(dest_path)
                 
-                # Move file
-                try:
-                    # Create backup before moving
-                    backup_path = None
-                    if os.path.exists(dest_path):
-                        backup_path = backup_file(dest_path)
-                    
-                    # Move file (shutil.move handles cross-device moves better than os.rename)
-                    shutil.move(src_path, dest_path)
-                    path_mapping[src_path] = dest_path
-                    logger.debug(f"Moved image {src_path} to {dest_path}")
-                    
-                except Exception as e:
-                    logger.error(f"Error moving image {src_path} to {dest_path}: {e}")
-                    # No need to restore backup - we'll handle this at the caller level
+                # Move file (shutil.move handles cross-device moves better than os.rename)
+                shutil.move(src_path, dest_path)
+                path_mapping[src_path] = dest_path
+                logger.debug("Moved image %s to %s", src_path, dest_path)
+                
+            except Exception as e:
+                logger.error("Error moving image %s to %s: %s", src_path, dest_path, e)
+                # No need to restore backup - we'll handle this at the caller level
         
         return path_mapping
         
     except Exception as e:
-        logger.error(f"Error during safe image move operation: {e}")
+        logger.error("Error during safe image move operation: %s", e)
         return path_mapping
 
 def cleanup_processing_dir(base_dir: str, keep_subdirs: Optional[List[str]] = None, deck_id: Optional[str] = None) -> bool:
@@ -409,7 +655,7 @@ def cleanup_processing_dir(base_dir: str, keep_subdirs: Optional[List[str]] = No
         keep_subdirs = ["questions", "images"]
         
     if not os.path.exists(base_dir) or not os.path.isdir(base_dir):
-        logger.warning(f"Processing directory does not exist: {base_dir}")
+        logger.warning("Processing directory does not exist: %s", base_dir)
         return True
     
     try:
@@ -422,23 +668,25 @@ def cleanup_processing_dir(base_dir: str, keep_subdirs: Optional[List[str]] = No
                 try:
                     if os.path.isfile(temp_file):
                         os.remove(temp_file)
-                        logger.debug(f"Removed temporary file: {temp_file}")
+                        logger.debug("Removed temporary file: %s", temp_file)
                 except Exception as e:
-                    logger.warning(f"Could not remove temporary file {temp_file}: {e}")
+                    logger.warning("Could not remove temporary file %s: %s", temp_file, e)
         
         # Clean up empty directories
+        base_len = len(os.path.join(base_dir, ''))
         for root, dirs, files in os.walk(base_dir, topdown=False):
+            root_prefix = os.path.join(root, '')
             for dir_name in dirs:
-                dir_path = os.path.join(root, dir_name)
+                dir_path = root_prefix + dir_name
                 try:
                     if not os.listdir(dir_path):  # Directory is empty
                         # Check if it's not in keep_subdirs
-                        rel_path = os.path.relpath(dir_path, base_dir)
+                        rel_path = dir_path[base_len:]
                         if not any(keep_dir in rel_path for keep_dir in keep_subdirs):
                             os.rmdir(dir_path)
-                            logger.debug(f"Removed empty directory: {dir_path}")
+                            logger.debug("Removed empty directory: %s", dir_path)
                 except Exception as e:
-                    logger.debug(f"Could not remove directory {dir_path}: {e}")
+                    logger.debug("Could not remove directory %s: %s", dir_path, e)
         
         # Get absolute paths of subdirectories to keep
         exclude_patterns = []
@@ -451,12 +699,12 @@ def cleanup_processing_dir(base_dir: str, keep_subdirs: Optional[List[str]] = No
         success = delete_dir(base_dir, exclude_patterns)
         
         if success:
-            logger.info(f"Successfully cleaned up processing directory: {base_dir}")
+            logger.info("Successfully cleaned up processing directory: %s", base_dir)
         
         return success
         
     except Exception as e:
-        logger.error(f"Error cleaning up processing directory {base_dir}: {e}")
+        logger.error("Error cleaning up processing directory %s: %s", base_dir, e)
         return False
 
 def cleanup_large_files(directory: str, size_limit_mb: int = 100) -> bool:
@@ -471,7 +719,7 @@ def cleanup_large_files(directory: str, size_limit_mb: int = 100) -> bool:
         bool: True if cleanup was successful, False otherwise
     """
     if not os.path.exists(directory) or not os.path.isdir(directory):
-        logger.warning(f"Directory does not exist: {directory}")
+        logger.warning("Directory does not exist: %s", directory)
         return True
     
     size_limit_bytes = size_limit_mb * 1024 * 1024
@@ -480,8 +728,9 @@ def cleanup_large_files(directory: str, size_limit_mb: int = 100) -> bool:
     
     try:
         for root, dirs, files in os.walk(directory):
+            root_prefix = os.path.join(root, '')
             for file in files:
-                file_path = os.path.join(root, file)
+                file_path = root_prefix + file
                 try:
                     if os.path.isfile(file_path):
                         file_size = os.path.getsize(file_path)
@@ -492,17 +741,17 @@ def cleanup_large_files(directory: str, size_limit_mb: int = 100) -> bool:
                                 os.remove(file_path)
                                 cleaned_files += 1
                                 total_freed += file_size
-                                logger.debug(f"Removed large temporary file: {file_path} ({file_size} bytes)")
+                                logger.debug("Removed large temporary file: %s (%s bytes)", file_path, file_size)
                 except Exception as e:
-                    logger.debug(f"Could not process file {file_path}: {e}")
+                    logger.debug("Could not process file %s: %s", file_path, e)
         
         if cleaned_files > 0:
-            logger.info(f"Cleaned up {cleaned_files} large files, freed {total_freed / (1024*1024):.2f} MB")
+            logger.info("Cleaned up %s large files, freed %.2f MB", cleaned_files, total_freed / (1024*1024))
         
         return True
         
     except Exception as e:
-        logger.error(f"Error cleaning up large files in {directory}: {e}")
+        logger.error("Error cleaning up large files in %s: %s", directory, e)
         return False
 
 def optimize_memory_usage():
@@ -515,7 +764,7 @@ def optimize_memory_usage():
         
         # Force garbage collection
         collected = gc.collect()
-        logger.debug(f"Garbage collection freed {collected} objects")
+        logger.debug("Garbage collection freed %s objects", collected)
         
         # Try to import PathResolver and clear its cache
         try:
@@ -540,14 +789,14 @@ def optimize_memory_usage():
                         file_age = time.time() - os.path.getmtime(temp_file)
                         if file_age > 3600:  # 1 hour
                             os.remove(temp_file)
-                            logger.debug(f"Removed old temp file: {temp_file}")
+                            logger.debug("Removed old temp file: %s", temp_file)
                 except Exception as e:
-                    logger.debug(f"Could not remove temp file {temp_file}: {e}")
+                    logger.debug("Could not remove temp file %s: %s", temp_file, e)
         
         logger.info("Memory optimization completed")
         
     except Exception as e:
-        logger.error(f"Error during memory optimization: {e}")
+        logger.error("Error during memory optimization: %s", e)
         
 def merge_json_files(json_files: List[str], output_file: str, merge_key: Optional[str] = None) -> Optional[str]:
     """
@@ -565,57 +814,134 @@ def merge_json_files(json_files: List[str], output_file: str, merge_key: Optiona
         logger.warning("No JSON files provided for merging")
         return None
         
-    merged_data = {}
-    
     try:
-        for json_file in json_files:
-            if not os.path.exists(json_file):
-                logger.warning(f"JSON file does not exist: {json_file}")
-                continue
-                
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    file_data = json.load(f)
-                    
-                if merge_key is not None:
-                    # Merge arrays under the specified key
-                    if merge_key not in merged_data:
-                        merged_data[merge_key] = []
-                        
-                    if merge_key in file_data and isinstance(file_data[merge_key], list):
-                        merged_data[merge_key].extend(file_data[merge_key])
-                    elif merge_key in file_data:
-                        merged_data[merge_key].append(file_data[merge_key])
-                        
-                    # Copy other keys from the first file
-                    if len(merged_data) == 1:  # Only merged_key exists
-                        for key, value in file_data.items():
-                            if key != merge_key:
-                                merged_data[key] = value
-                else:
-                    # Simple merge: later files override earlier ones
-                    merged_data.update(file_data)
-                    
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing JSON file {json_file}: {e}")
-                continue
-                
         # Create output directory if needed
         output_dir = os.path.dirname(output_file)
         if output_dir:
             ensure_dir(output_dir)
+        
+        if merge_key is not None:
+            # Stream merged items to a temp file so a failed merge leaves
+            # any previous output_file untouched
+            with _replacing(output_file) as tmp_path:
+                with open(tmp_path, 'w', encoding='utf-8') as out:
+                    _write_merged_by_key(json_files, out, merge_key)
+        else:
+            merged_data = {}
+            for json_file in json_files:
+                file_data = _load_json_for_merge(json_file)
+                if file_data is not None:
+                    # Simple merge: later files override earlier ones
+                    merged_data.update(file_data)
             
-        # Write merged data to output file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(merged_data, f, indent=2, ensure_ascii=False)
+            # Write merged data to output file
+            _dump_json(merged_data, output_file)
             
-        logger.info(f"Successfully merged {len(json_files)} JSON files to {output_file}")
+        logger.info("Successfully merged %s JSON files to %s", len(json_files), output_file)
         return output_file
         
     except Exception as e:
-        logger.error(f"Error merging JSON files: {e}")
+        logger.error("Error merging JSON files: %s", e)
+        return None
+
+def _load_json_for_merge(json_file: str) -> Optional[Dict]:
+    """Load one merge input, logging and returning None if it is missing or invalid."""
+    if not os.path.exists(json_file):
+        logger.warning("JSON file does not exist: %s", json_file)
+        return None
+        
+    try:
+        return _load_json(json_file)
+    except json.JSONDecodeError as e:
+        logger.error("Error parsing JSON file %s: %s", json_file, e)
         return None
+
+def _write_merged_by_key(json_files: List[str], out, merge_key: str) -> None:
+    """
+    Write the merge of json_files under merge_key to an open text stream.
+    
+    Produces the same document as json.dump(..., indent=2, ensure_ascii=False)
+    of the fully merged dict (merge_key first, then the other keys of the
+    first file that has any), but writes each input's items as soon as that
+    file is parsed, so only one input is held in memory at a time instead of
+    the whole merged list.
+    """
+    other_data = {}
+    started = False
+    first_item = True
+    
+    for json_file in json_files:
+        file_data = _load_json_for_merge(json_file)
+        if file_data is None:
+            continue
+        
+        if not started:
+            out.write('{\n  ' + json.dumps(merge_key, ensure_ascii=False) + ': [')
+            started = True
+        
+        # Merge arrays under the specified key; non-list values are appended as one item
+        if merge_key in file_data:
+            value = file_data[merge_key]
+            for item in (value if isinstance(value, list) else [value]):
+                out.write('\n    ' if first_item else ',\n    ')
+                out.write(json.dumps(item, indent=2, ensure_ascii=False).replace('\n', '\n    '))
+                first_item = False
+        
+        # Copy other keys from the first file
+        if not other_data:
+            other_data = {key: value for key, value in file_data.items() if key != merge_key}
+    
+    if not started:
+        out.write('{}')
+        return
+    
+    out.write(']' if first_item else '\n  ]')
+    for key, value in other_data.items():
+        out.write(',\n  ' + json.dumps(key, ensure_ascii=False) + ': ')
+        out.write(json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+    out.write('\n}')
         
+@contextmanager
+def _replacing(file_path: str) -> Iterator[str]:
+    """
+    Yield a unique sibling temp path that replaces file_path on success.
+    
+    The temp file takes file_path's permission bits before os.replace, or
+    for a new file the usual ones under the process umask; if the body
+    raises, it is removed and file_path is left as it was.
+    """
+    # Created like open() creates files (mode 0o666, which the kernel masks
+    # with the umask) rather than with mkstemp's 0o600
+    while True:
+        tmp_path = f"{file_path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            os.close(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            break
+        except FileExistsError:
+            continue
+    try:
+        yield tmp_path
+        try:
+            shutil.copymode(file_path, tmp_path)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _atomic_dump_json(data: Any, file_path: str) -> None:
+    """
+    Write JSON to file_path atomically.
+    
+    The data is written and fsynced to a unique sibling temp file which then
+    replaces file_path, so readers and crashes never see a partial file and
+    concurrent saves never share a temp file.
+    """
+    with _replacing(file_path) as tmp_path:
+        _dump_json(data, tmp_path, fsync=True)
+
 def manage_flashcards(deck_path: str, operation: str, cards: Optional[List[Dict]] = None, 
                       card_ids: Optional[List[str]] = None, 
                       update_data: Optional[Dict] = None) -> Tuple[bool, Optional[Dict]]:
@@ -634,17 +960,16 @@ def manage_flashcards(deck_path: str, operation: str, cards: Optional[List[Dict]
     """
     if not os.path.exists(deck_path):
         if operation != 'add':
-            logger.error(f"Deck file does not exist: {deck_path}")
+            logger.error("Deck file does not exist: %s", deck_path)
             return False, None
         
         # For 'add' operation, create a new deck if it doesn't exist
         deck_data = {"cards": [], "metadata": {"created_at": datetime.now().isoformat()}}
     else:
         try:
-            with open(deck_path, 'r', encoding='utf-8') as f:
-                deck_data = json.load(f)
+            deck_data = _load_json_readonly(deck_path) if operation == 'get' else _load_json(deck_path)
         except (json.JSONDecodeError, IOError) as e:
-            logger.error(f"Error reading deck file {deck_path}: {e}")
+            logger.error("Error reading deck file %s: %s", deck_path, e)
             # Create backup of corrupted file
             if os.path.exists(deck_path):
                 backup_file(deck_path)
@@ -657,11 +982,17 @@ def manage_flashcards(deck_path: str, operation: str, cards: Optional[List[Dict]
         if "cards" not in deck_data:
             deck_data["cards"] = []
             
+        # One timestamp for the whole operation instead of one per card
+        now_iso = datetime.now().isoformat()
+            
         if "metadata" not in deck_data:
-            deck_data["metadata"] = {"created_at": datetime.now().isoformat()}
+            deck_data["metadata"] = {"created_at": now_iso}
             
         # Update the last modified timestamp
-        deck_data["metadata"]["last_modified"] = datetime.now().isoformat()
+        deck_data["metadata"]["last_modified"] = now_iso
+            
+        # Set membership keeps id filtering O(N + M) instead of O(N * M)
+        card_id_set = frozenset(card_ids) if card_ids else frozenset()
             
         # Perform the requested operation
         if operation == 'add' and cards:
@@ -669,16 +1000,15 @@ def manage_flashcards(deck_path: str, operation: str, cards: Optional[List[Dict]
             for card in cards:
                 if 'id' not in card:
                     card['id'] = str(uuid.uuid4())
-                if 'created_at' not in card:
-                    card['created_at'] = datetime.now().isoformat()
+                card.setdefault('created_at', now_iso)
                     
             deck_data["cards"].extend(cards)
-            result = {"added_count": len(cards), "added_ids": [card.get('id') for card in cards]}
+            result = {"added_count": len(cards), "added_ids": [card['id'] for card in cards]}
             
         elif operation == 'delete' and card_ids:
             # Delete cards from the deck
             original_count = len(deck_data["cards"])
-            deck_data["cards"] = [card for card in deck_data["cards"] if card.get('id') not in card_ids]
+            deck_data["cards"] = [card for card in deck_data["cards"] if card.get('id') not in card_id_set]
             deleted_count = original_count - len(deck_data["cards"])
             result = {"deleted_count": deleted_count}
             
@@ -686,9 +1016,9 @@ def manage_flashcards(deck_path: str, operation: str, cards: Optional[List[Dict]
             # Update existing cards
             updated_count = 0
             for card in deck_data["cards"]:
-                if card.get('id') in card_ids:
+                if card.get('id') in card_id_set:
                     card.update(update_data)
-                    card['last_modified'] = datetime.now().isoformat()
+                    card['last_modified'] = now_iso
                     updated_count += 1
                     
             result = {"updated_count": updated_count}
@@ -696,12 +1026,12 @@ def manage_flashcards(deck_path: str, operation: str, cards: Optional[List[Dict]
         elif operation == 'get':
             # Get all cards or specific cards
             if card_ids:
-                result = {"cards": [card for card in deck_data["cards"] if card.get('id') in card_ids]}
+                result = {"cards": [card for card in deck_data["cards"] if card.get('id') in card_id_set]}
             else:
                 result = {"cards": deck_data["cards"], "metadata": deck_data.get("metadata", {})}
                 
         else:
-            logger.error(f"Invalid operation or missing required parameters: {operation}")
+            logger.error("Invalid operation or missing required parameters: %s", operation)
             return False, None
             
         # Save the updated deck (except for 'get' operation)
@@ -711,21 +1041,52 @@ def manage_flashcards(deck_path: str, operation: str, cards: Optional[List[Dict]
             if output_dir:
                 ensure_dir(output_dir)
                 
-            # Save the deck with a backup
-            if os.path.exists(deck_path):
-                backup_file(deck_path)
+            # Atomic replace, so no pre-save backup copy is needed
+            _atomic_dump_json(deck_data, deck_path)
                 
-            with open(deck_path, 'w', encoding='utf-8') as f:
-                json.dump(deck_data, f, indent=2, ensure_ascii=False)
-                
-            logger.info(f"Successfully performed '{operation}' operation on deck: {deck_path}")
+            logger.info("Successfully performed '%s' operation on deck: %s", operation, deck_path)
             
         return True, result
         
     except Exception as e:
-        logger.error(f"Error managing flashcard deck {deck_path}: {e}")
+        logger.error("Error managing flashcard deck %s: %s", deck_path, e)
         return False, None
         
+# Below this many files a thread pool costs more than it saves
+_BULK_COPY_PARALLEL_THRESHOLD = 16
+
+def _bulk_copy(pairs: List[Tuple[str, str]], max_workers: int = 8) -> List[str]:
+    """
+    Copy many files, preserving metadata, overlapping the copies in threads.
+    
+    Small files are dominated by per-file open/read/write/close latency rather
+    than bandwidth, so larger batches are spread over a thread pool;
+    shutil.copy2 already uses in-kernel copying where the OS supports it.
+    
+    Args:
+        pairs (List[Tuple[str, str]]): (source, destination) file paths
+        max_workers (int): Maximum number of copy threads
+        
+    Returns:
+        List[str]: Destination paths, in the order given
+        
+    Raises:
+        OSError: If any copy fails
+    """
+    # Sources sharing a destination (e.g. same basename in different
+    # subdirectories) must not be copied concurrently; as with copying them
+    # one after another, the last one wins
+    sources_by_dest = {dst: src for src, dst in pairs}
+    
+    if len(sources_by_dest) <= _BULK_COPY_PARALLEL_THRESHOLD:
+        for dst, src in sources_by_dest.items():
+            shutil.copy2(src, dst)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(lambda item: shutil.copy2(item[1], item[0]), sources_by_dest.items()))
+    
+    return [dst for _, dst in pairs]
+
 def import_export_deck(src_path: str, dest_path: str, operation: str, 
                        format_type: str = 'json', 
                        include_images: bool = True) -> Tuple[bool, Optional[Dict]]:
@@ -759,8 +1120,7 @@ def import_export_deck(src_path: str, dest_path: str, operation: str,
                 # Handle images if needed
                 if include_images and os.path.exists(src_path):
                     try:
-                        with open(src_path, 'r', encoding='utf-8') as f:
-                            deck_data = json.load(f)
+                        deck_data = _load_json(src_path)
                             
                         # Extract image paths
                         image_paths = []
@@ -777,17 +1137,15 @@ def import_export_deck(src_path: str, dest_path: str, operation: str,
                             images_dir = os.path.join(dest_dir, "images")
                             ensure_dir(images_dir)
                             
-                            copied_images = []
+                            copy_pairs = []
                             for img_path in image_paths:
                                 if os.path.exists(img_path):
                                     img_name = os.path.basename(img_path)
-                                    dest_img_path = os.path.join(images_dir, img_name)
-                                    shutil.copy2(img_path, dest_img_path)
-                                    copied_images.append(dest_img_path)
+                                    copy_pairs.append((img_path, os.path.join(images_dir, img_name)))
                                     
-                            result["exported_images"] = copied_images
+                            result["exported_images"] = _bulk_copy(copy_pairs)
                     except json.JSONDecodeError:
-                        logger.warning(f"Could not parse JSON deck for image export: {src_path}")
+                        logger.warning("Could not parse JSON deck for image export: %s", src_path)
             
             elif operation == 'import':
                 # Copy the JSON file to destination
@@ -805,15 +1163,10 @@ def import_export_deck(src_path: str, dest_path: str, operation: str,
                         
                         # Copy all images
                         image_files = find_files(images_dir, "**/*.{jpg,jpeg,png,gif}")
-                        copied_images = []
-                        
-                        for img_path in image_files:
-                            img_name = os.path.basename(img_path)
-                            dest_img_path = os.path.join(dest_images_dir, img_name)
-                            shutil.copy2(img_path, dest_img_path)
-                            copied_images.append(dest_img_path)
+                        copy_pairs = [(img_path, os.path.join(dest_images_dir, os.path.basename(img_path)))
+                                      for img_path in image_files]
                             
-                        result["imported_images"] = copied_images
+                        result["imported_images"] = _bulk_copy(copy_pairs)
         
         # Handle CSV format
         elif format_type == 'csv':
@@ -822,10 +1175,9 @@ def import_export_deck(src_path: str, dest_path: str, operation: str,
             if operation == 'export':
                 # Export deck to CSV
                 try:
-                    with open(src_path, 'r', encoding='utf-8') as f:
-                        deck_data = json.load(f)
+                    deck_data = _load_json_readonly(src_path)
                     
-                    with open(dest_path, 'w', newline='', encoding='utf-8') as csvfile:
+                    with open(dest_path, 'w', newline='', encoding='utf-8', buffering=_EXPORT_BUFFER_SIZE) as csvfile:
                         fieldnames = ['id', 'front', 'back', 'front_image', 'back_image', 
                                      'tags', 'created_at', 'last_modified']
                         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -841,7 +1193,7 @@ def import_export_deck(src_path: str, dest_path: str, operation: str,
                             
                     result = {"exported_path": dest_path, "card_count": len(deck_data.get("cards", []))}
                 except Exception as e:
-                    logger.error(f"Error exporting deck to CSV: {e}")
+                    logger.error("Error exporting deck to CSV: %s", e)
                     return False, None
             
             elif operation == 'import':
@@ -867,57 +1219,58 @@ def import_export_deck(src_path: str, dest_path: str, operation: str,
                     }
                     
                     # Save to the destination path
-                    with open(dest_path, 'w', encoding='utf-8') as f:
-                        json.dump(deck_data, f, indent=2, ensure_ascii=False)
+                    _dump_json(deck_data, dest_path)
                         
                     result = {"imported_path": dest_path, "card_count": len(cards)}
                 except Exception as e:
-                    logger.error(f"Error importing CSV to deck: {e}")
+                    logger.error("Error importing CSV to deck: %s", e)
                     return False, None
         
         # Handle Markdown format
         elif format_type == 'markdown':
             if operation == 'export':
                 try:
-                    with open(src_path, 'r', encoding='utf-8') as f:
-                        deck_data = json.load(f)
+                    deck_data = _load_json_readonly(src_path)
                     
-                    with open(dest_path, 'w', encoding='utf-8') as md_file:
-                        md_file.write(f"# Flashcard Deck\n\n")
-                        md_file.write(f"Created: {deck_data.get('metadata', {}).get('created_at', '')}\n\n")
+                    # Build the whole document in memory and write it once
+                    created_at = deck_data.get('metadata', {}).get('created_at', '')
+                    parts = [f"# Flashcard Deck\n\nCreated: {created_at}\n\n"]
+                    
+                    for i, card in enumerate(deck_data.get("cards", []), 1):
+                        # Look each field up once per card
+                        front_image = card.get('front_image')
+                        back_image = card.get('back_image')
+                        tags = card.get('tags')
                         
-                        for i, card in enumerate(deck_data.get("cards", [])):
-                            md_file.write(f"## Card {i+1}\n\n")
-                            md_file.write(f"### Front\n\n{card.get('front', '')}\n\n")
+                        parts.append(f"## Card {i}\n\n### Front\n\n{card.get('front', '')}\n\n")
+                        if front_image:
+                            parts.append(f"![Front Image]({front_image})\n\n")
                             
-                            if card.get('front_image'):
-                                md_file.write(f"![Front Image]({card.get('front_image')})\n\n")
-                                
-                            md_file.write(f"### Back\n\n{card.get('back', '')}\n\n")
+                        parts.append(f"### Back\n\n{card.get('back', '')}\n\n")
+                        if back_image:
+                            parts.append(f"![Back Image]({back_image})\n\n")
                             
-                            if card.get('back_image'):
-                                md_file.write(f"![Back Image]({card.get('back_image')})\n\n")
-                                
-                            if card.get('tags'):
-                                tags = card.get('tags')
-                                if isinstance(tags, list):
-                                    tags = ', '.join(tags)
-                                md_file.write(f"**Tags**: {tags}\n\n")
-                                
-                            md_file.write("---\n\n")
+                        if tags:
+                            tags_str = ', '.join(tags) if isinstance(tags, (list, tuple)) else tags
+                            parts.append(f"**Tags**: {tags_str}\n\n")
+                            
+                        parts.append("---\n\n")
+                    
+                    with open(dest_path, 'w', encoding='utf-8', buffering=_EXPORT_BUFFER_SIZE) as md_file:
+                        md_file.write("".join(parts))
                             
                     result = {"exported_path": dest_path, "card_count": len(deck_data.get("cards", []))}
                 except Exception as e:
-                    logger.error(f"Error exporting deck to Markdown: {e}")
+                    logger.error("Error exporting deck to Markdown: %s", e)
                     return False, None
                     
         else:
-            logger.error(f"Unsupported format type: {format_type}")
+            logger.error("Unsupported format type: %s", format_type)
             return False, None
             
-        logger.info(f"Successfully {operation}ed deck to/from {format_type} format")
+        logger.info("Successfully %sed deck to/from %s format", operation, format_type)
         return True, result
         
     except Exception as e:
-        logger.error(f"Error in import/export operation: {e}")
+        logger.error("Error in import/export operation: %s", e)
         return False, None
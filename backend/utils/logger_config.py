@@ -1,17 +1,28 @@
 import logging
+import logging.handlers
+import atexit
+import queue
 import sys
 import os
 
 # Module-wide singleton logger
 _logger = None 
-_logger_initialized = False  # Track if we've initialized the logger
 
 # Directly exportable logger - other modules should import this
 logger = None
 
+# Background thread that writes queued records to the log file
+_queue_listener = None
+
 def config_logger():
-    """Configure and return the logger singleton. This should typically only be called once in the main module."""
-    global _logger, _logger_initialized, logger
+    """
+    Configure and return the logger singleton. This should typically only be called once in the main module.
+    
+    Log calls should pass their arguments %-style rather than pre-formatting
+    them, e.g. ``logger.error("Error importing CSV to deck: %s", e)``, so the
+    message is only formatted when a handler actually emits the record.
+    """
+    global _logger, logger, _queue_listener
     if _logger is not None:
         return _logger
     
@@ -41,20 +52,23 @@ def config_logger():
         console_handler.setFormatter(formatter)
         file_handler.setFormatter(formatter)
 
+        # The file is written from a listener thread so logging callers never
+        # block on disk I/O; they only enqueue the record
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(logging.INFO)
+        _queue_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _queue_listener.start()
+        atexit.register(_queue_listener.stop)
+
         _logger.addHandler(console_handler)
-        _logger.addHandler(file_handler)
+        _logger.addHandler(queue_handler)
 
         _logger.propagate = False
 
     # Set the exportable logger to the configured logger
-    global logger
     logger = _logger
     
-    # Track that we've initialized the logger and handle first-time initialization messages
-    global _logger_initialized
-    if not _logger_initialized:
-        _logger_initialized = True
-    
     return _logger
 
 def get_logger():
@@ -68,8 +82,5 @@ def get_logger():
     logger = get_logger()
     
     """
-    global logger, _logger
-    if logger is None:
-        # If the logger hasn't been initialized yet, initialize it
-        config_logger()
-    return logger
\ No newline at end of file
+    # Initializes the logger on first use
+    return _logger or config_logger()
\ No newline at end of file
@@ -7,21 +7,32 @@ bugs in the application.
 """
 
 import os
+import sys
 import logging
-import time
+import functools
 import threading
-from typing import Optional, Dict, Any
+from typing import Optional, FrozenSet, Tuple
 from dataclasses import dataclass
 
 
+# Directory of this module (backend/utils). __file__ is already absolute for
+# imported modules, so os.path.abspath (and its getcwd call) is only needed
+# in the rare relative case
+_MODULE_DIR = (os.path.normpath(os.path.dirname(__file__)) if os.path.isabs(__file__)
+               else os.path.dirname(os.path.abspath(__file__)))
+
+# dataclass(slots=True) is only available on Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
 class PathResolutionError(Exception):
     """Custom exception for path resolution failures."""
     pass
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class PathConfig:
-    """Configuration object containing all resolved paths."""
+    """Configuration object containing all resolved paths (immutable once resolved)."""
     project_root: str
     decks_dir: str
     static_dir: str
@@ -35,104 +46,98 @@ class PathConfig:
         try:
             for path in [self.decks_dir, self.static_dir, self.images_dir, 
                         self.processing_dir, self.logs_dir]:
-                if not os.path.exists(path):
-                    os.makedirs(path, exist_ok=True)
+                os.makedirs(path, exist_ok=True)
             return True
         except Exception as e:
-            logging.error(f"Path validation failed: {e}")
+            logging.error("Path validation failed: %s", e)
             return False
 
 
+# Build artifacts (regular files) that mark a CMake build directory
+_BUILD_INDICATORS = frozenset({'CMakeCache.txt', 'build.ninja', 'Makefile'})
+
+# Primary project marker, and secondary markers of which two identify the root
+_CMAKE = 'CMakeLists.txt'
+_FALLBACK_MARKERS = frozenset({'README.md', '.git', 'main.cpp'})
+
+def _entry_names(directory: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    Names of all entries and of the regular files in a directory.
+    
+    File types come from the scandir results themselves, so no extra stat
+    is needed. Both sets are empty if the directory cannot be listed.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            entries = list(entries)
+    except OSError:
+        return frozenset(), frozenset()
+    return (frozenset(entry.name for entry in entries),
+            frozenset(entry.name for entry in entries if entry.is_file(follow_symlinks=False)))
+
+
+def _walk_up(directory: str):
+    """Yield a directory and each of its ancestors, stopping before the filesystem root."""
+    while directory != os.path.dirname(directory):
+        yield directory
+        directory = os.path.dirname(directory)
+
+
+def _is_project_root(directory: str) -> bool:
+    """Whether a directory carries the markers of the project root."""
+    # One directory listing per level instead of a stat per marker
+    entries, file_names = _entry_names(directory)
+    
+    # Look for CMakeLists.txt as the primary project marker
+    if _CMAKE in entries:
+        # Check if this is a build directory by looking for build artifacts
+        if not file_names.isdisjoint(_BUILD_INDICATORS):
+            logging.info("Found CMakeLists.txt in build directory, continuing search: %s", directory)
+            return False
+        logging.info("Found project root via CMakeLists.txt: %s", directory)
+        return True
+    
+    # Also check for other project markers as fallback; if we find
+    # multiple markers, this is likely the project root
+    if len(entries & _FALLBACK_MARKERS) >= 2:
+        logging.info("Found project root via multiple markers: %s", directory)
+        return True
+    return False
+
+
 class PathResolver:
     """
     Centralized path resolution utility that works in both development and build environments.
     
     This class provides methods to determine the correct project root and resolve all
     application paths consistently, regardless of where the application is executed from.
+    PathResolver() returns the shared instance, the same one get_resolver() returns.
     
     Features performance optimizations:
-    - Caching of resolved paths to avoid repeated calculations
-    - Thread-safe singleton implementation
-    - Cache invalidation based on file system changes
+    - Project root and paths resolved once and memoized
+    - Single shared instance created once, under a lock, by get_resolver
+    - Explicit invalidation through clear_cache
     """
     
-    _instance: Optional['PathResolver'] = None
     _config: Optional[PathConfig] = None
-    _cache: Dict[str, Any] = {}
-    _cache_timestamps: Dict[str, float] = {}
-    _cache_ttl: float = 300.0  # 5 minutes cache TTL
-    _lock = threading.RLock()  # Reentrant lock for thread safety
     
     def __new__(cls) -> 'PathResolver':
-        """Thread-safe singleton pattern to ensure consistent path resolution."""
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-            return cls._instance
+        return get_resolver()
     
     def __init__(self):
-        """Initialize the PathResolver if not already initialized."""
-        with self._lock:
-            if self._config is None:
-                self._config = self._resolve_all_paths()
-    
-    @classmethod
-    def _get_cached_value(cls, key: str, compute_func, *args, **kwargs) -> Any:
-        """
-        Get a cached value or compute it if not cached or expired.
-        
-        Args:
-            key: Cache key
-            compute_func: Function to compute the value if not cached
-            *args, **kwargs: Arguments to pass to compute_func
-            
-        Returns:
-            Cached or computed value
-        """
-        with cls._lock:
-            current_time = time.time()
-            
-            # Check if we have a valid cached value
-            if (key in cls._cache and 
-                key in cls._cache_timestamps and 
-                current_time - cls._cache_timestamps[key] < cls._cache_ttl):
-                return cls._cache[key]
-            
-            # Compute new value
-            value = compute_func(*args, **kwargs)
-            
-            # Cache the result
-            cls._cache[key] = value
-            cls._cache_timestamps[key] = current_time
-            
-            return value
-    
-    @classmethod
-    def _invalidate_cache(cls, key: Optional[str] = None):
-        """
-        Invalidate cache entries.
-        
-        Args:
-            key: Specific key to invalidate, or None to clear all cache
-        """
-        with cls._lock:
-            if key is None:
-                cls._cache.clear()
-                cls._cache_timestamps.clear()
-                logging.info("PathResolver cache cleared")
-            elif key in cls._cache:
-                del cls._cache[key]
-                if key in cls._cache_timestamps:
-                    del cls._cache_timestamps[key]
-                logging.debug(f"PathResolver cache invalidated for key: {key}")
+        """Resolve all application paths, unless the shared instance already has."""
+        if self._config is None:
+            self._config = self._resolve_all_paths()
     
     @classmethod
     def _compute_project_root(cls) -> str:
         """
         Internal method to compute the project root directory.
         
-        This method looks for project markers (CMakeLists.txt) to identify the
-        true project root, working in both development and build environments.
+        The RECALL_PROJECT_ROOT environment variable, when it names an existing
+        directory, is used as-is. Otherwise this method looks for project markers
+        (CMakeLists.txt) to identify the true project root, working in both
+        development and build environments.
         
         Returns:
             str: Absolute path to the project root directory
@@ -140,76 +145,40 @@ class PathResolver:
         Raises:
             PathResolutionError: If project root cannot be determined
         """
+        # An explicit RECALL_PROJECT_ROOT wins and skips the directory walk
+        env_root = os.environ.get('RECALL_PROJECT_ROOT')
+        if env_root and os.path.isdir(env_root):
+            logging.info("Using environment variable for project root: %s", env_root)
+            return env_root
+        
+        # Walk up from the current file's directory (backend/utils/)
+        ancestors = list(_walk_up(_MODULE_DIR))
+        for current in ancestors:
+            if _is_project_root(current):
+                return current
+        
+        # Then try the current working directory unless the walk already
+        # covered it. It is only needed here, so a removed working directory
+        # does not matter when the walk finds the root
         try:
-            # Start from the current file's directory (backend/utils/)
-            current = os.path.dirname(os.path.abspath(__file__))
-            
-            # Walk up the directory tree looking for project markers
-            while current != os.path.dirname(current):  # Stop at filesystem root
-                # Look for CMakeLists.txt as the primary project marker
-                cmake_file = os.path.join(current, 'CMakeLists.txt')
-                if os.path.exists(cmake_file):
-                    # Check if this is a build directory by looking for build artifacts
-                    build_indicators = ['CMakeCache.txt', 'build.ninja', 'Makefile']
-                    is_build_dir = any(os.path.exists(os.path.join(current, indicator)) 
-                                     for indicator in build_indicators)
-                    
-                    if is_build_dir:
-                        logging.info(f"Found CMakeLists.txt in build directory, continuing search: {current}")
-                        # This is a build directory, continue searching
-                        current = os.path.dirname(current)
-                        continue
-                    else:
-                        logging.info(f"Found project root via CMakeLists.txt: {current}")
-                        return current
-                
-                # Also check for other project markers as fallback
-                markers = ['README.md', '.git', 'main.cpp']
-                marker_count = sum(1 for marker in markers 
-                                 if os.path.exists(os.path.join(current, marker)))
-                
-                # If we find multiple markers, this is likely the project root
-                if marker_count >= 2:
-                    logging.info(f"Found project root via multiple markers: {current}")
-                    return current
-                
-                current = os.path.dirname(current)
-            
-            # Fallback: Use environment variable if set
-            env_root = os.environ.get('RECALL_PROJECT_ROOT')
-            if env_root and os.path.exists(env_root):
-                logging.warning(f"Using environment variable for project root: {env_root}")
-                return env_root
-            
-            # Check current working directory as a potential project root
             cwd = os.getcwd()
-            cwd_cmake = os.path.join(cwd, 'CMakeLists.txt')
-            if os.path.exists(cwd_cmake):
-                # Check if CWD is a build directory
-                build_indicators = ['CMakeCache.txt', 'build.ninja', 'Makefile']
-                is_build_dir = any(os.path.exists(os.path.join(cwd, indicator)) 
-                                 for indicator in build_indicators)
-                
-                if not is_build_dir:
-                    logging.info(f"Using current working directory as project root: {cwd}")
-                    return cwd
-                else:
-                    logging.warning(f"Current working directory appears to be a build directory: {cwd}")
-            
-            # Last resort: Use current working directory anyway
-            logging.warning(f"Falling back to current working directory: {cwd}")
-            return cwd
-            
-        except Exception as e:
-            logging.error(f"Path resolution failed: {e}")
+        except OSError as e:
+            logging.error("Path resolution failed: %s", e)
             raise PathResolutionError(f"Cannot determine project root: {e}")
+        if cwd not in ancestors and _is_project_root(cwd):
+            return cwd
+        
+        # Last resort: Use current working directory anyway
+        logging.warning("Falling back to current working directory: %s", cwd)
+        return cwd
     
     @staticmethod
     def get_project_root() -> str:
         """
         Determine the project root directory regardless of execution context.
         
-        This method uses caching to avoid repeated file system operations.
+        The directory walk runs once per process (or after clear_cache); later
+        calls return the memoized result without touching the file system.
         
         Returns:
             str: Absolute path to the project root directory
@@ -217,7 +186,7 @@ class PathResolver:
         Raises:
             PathResolutionError: If project root cannot be determined
         """
-        return PathResolver._get_cached_value("project_root", PathResolver._compute_project_root)
+        return _cached_project_root()
     
     @classmethod
     def get_backend_dir(cls) -> str:
@@ -227,8 +196,7 @@ class PathResolver:
         Returns:
             str: Absolute path to the backend directory
         """
-        return cls._get_cached_value("backend_dir", 
-                                   lambda: os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return _cached_backend_dir()
     
     @classmethod
     def get_decks_dir(cls) -> str:
@@ -238,8 +206,7 @@ class PathResolver:
         Returns:
             str: Absolute path to the decks directory
         """
-        return cls._get_cached_value("decks_dir", 
-                                   lambda: os.path.join(cls.get_project_root(), 'decks'))
+        return _cfg().decks_dir
     
     @classmethod
     def get_static_dir(cls) -> str:
@@ -249,8 +216,7 @@ class PathResolver:
         Returns:
             str: Absolute path to the static directory
         """
-        return cls._get_cached_value("static_dir", 
-                                   lambda: os.path.join(cls.get_project_root(), 'static'))
+        return _cfg().static_dir
     
     @classmethod
     def get_images_dir(cls) -> str:
@@ -260,8 +226,7 @@ class PathResolver:
         Returns:
             str: Absolute path to the images directory
         """
-        return cls._get_cached_value("images_dir", 
-                                   lambda: os.path.join(cls.get_static_dir(), 'images'))
+        return _cfg().images_dir
     
     @classmethod
     def get_processing_dir(cls) -> str:
@@ -271,8 +236,7 @@ class PathResolver:
         Returns:
             str: Absolute path to the processing directory
         """
-        return cls._get_cached_value("processing_dir", 
-                                   lambda: os.path.join(cls.get_project_root(), 'to_process'))
+        return _cfg().processing_dir
     
     @classmethod
     def get_logs_dir(cls) -> str:
@@ -282,8 +246,7 @@ class PathResolver:
         Returns:
             str: Absolute path to the logs directory
         """
-        return cls._get_cached_value("logs_dir", 
-                                   lambda: os.path.join(cls.get_backend_dir(), 'logs'))
+        return _cfg().logs_dir
     
     @classmethod
     def resolve_path(cls, relative_path: str) -> str:
@@ -296,9 +259,8 @@ class PathResolver:
         Returns:
             str: Absolute path
         """
-        if os.path.isabs(relative_path):
-            return relative_path
-        return os.path.join(cls.get_project_root(), relative_path)
+        # os.path.join returns an absolute second argument unchanged
+        return os.path.join(_cfg().project_root, relative_path)
     
     def _resolve_all_paths(self) -> PathConfig:
         """
@@ -311,14 +273,15 @@ class PathResolver:
             project_root = self.get_project_root()
             backend_dir = self.get_backend_dir()
             
+            # Interned so the paths handed out everywhere share one string object
             config = PathConfig(
-                project_root=project_root,
-                decks_dir=os.path.join(project_root, 'decks'),
-                static_dir=os.path.join(project_root, 'static'),
-                images_dir=os.path.join(project_root, 'static', 'images'),
-                processing_dir=os.path.join(project_root, 'to_process'),
-                logs_dir=os.path.join(backend_dir, 'logs'),
-                backend_dir=backend_dir
+                project_root=sys.intern(project_root),
+                decks_dir=sys.intern(os.path.join(project_root, 'decks')),
+                static_dir=sys.intern(os.path.join(project_root, 'static')),
+                images_dir=sys.intern(os.path.join(project_root, 'static', 'images')),
+                processing_dir=sys.intern(os.path.join(project_root, 'to_process')),
+                logs_dir=sys.intern(os.path.join(backend_dir, 'logs')),
+                backend_dir=sys.intern(backend_dir)
             )
             
             # Validate and create directories
@@ -326,19 +289,20 @@ class PathResolver:
                 raise PathResolutionError("Failed to validate or create required directories")
             
             # Log the resolved paths for debugging
-            logging.info("PathResolver initialized with the following paths:")
-            logging.info(f"  Project Root: {config.project_root}")
-            logging.info(f"  Backend Dir: {config.backend_dir}")
-            logging.info(f"  Decks Dir: {config.decks_dir}")
-            logging.info(f"  Static Dir: {config.static_dir}")
-            logging.info(f"  Images Dir: {config.images_dir}")
-            logging.info(f"  Processing Dir: {config.processing_dir}")
-            logging.info(f"  Logs Dir: {config.logs_dir}")
-            
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info("PathResolver initialized with the following paths:")
+                logging.info("  Project Root: %s", config.project_root)
+                logging.info("  Backend Dir: %s", config.backend_dir)
+                logging.info("  Decks Dir: %s", config.decks_dir)
+                logging.info("  Static Dir: %s", config.static_dir)
+                logging.info("  Images Dir: %s", config.images_dir)
+                logging.info("  Processing Dir: %s", config.processing_dir)
+                logging.info("  Logs Dir: %s", config.logs_dir)
+                
             return config
             
         except Exception as e:
-            logging.error(f"Failed to resolve application paths: {e}")
+            logging.error("Failed to resolve application paths: %s", e)
             raise PathResolutionError(f"Path resolution failed: {e}")
     
     def get_config(self) -> PathConfig:
@@ -348,10 +312,13 @@ class PathResolver:
         Returns:
             PathConfig: The resolved path configuration
         """
-        with self._lock:
-            if self._config is None:
-                self._config = self._resolve_all_paths()
-            return self._config
+        # No lock: the config is immutable and published with a single
+        # attribute store. Threads racing after clear_cache may each resolve,
+        # but resolution is idempotent so any of the results is correct.
+        config = self._config
+        if config is None:
+            config = self._config = self._resolve_all_paths()
+        return config
     
     @classmethod
     def clear_cache(cls):
@@ -361,10 +328,15 @@ class PathResolver:
         This should be called if the file system structure changes
         or if you need to force re-resolution of paths.
         """
-        cls._invalidate_cache()
-        # Also clear the singleton's config to force re-resolution
-        if cls._instance is not None:
-            cls._instance._config = None
+        global _CONFIG
+        _CONFIG = None
+        _cached_project_root.cache_clear()
+        _cached_backend_dir.cache_clear()
+        _project_root_prefix.cache_clear()
+        logging.info("PathResolver cache cleared")
+        # Also clear the shared instance's config to force re-resolution
+        if _RESOLVER is not None:
+            _RESOLVER._config = None
     
     def ensure_directory_exists(self, path: str) -> bool:
         """
@@ -377,13 +349,15 @@ class PathResolver:
             bool: True if directory exists or was created successfully
         """
         try:
-            if not os.path.exists(path):
-                os.makedirs(path, exist_ok=True)
-                logging.info(f"Created directory: {path}")
-            return True
+            # EAFP: one mkdir attempt instead of a stat followed by makedirs
+            os.makedirs(path)
+            logging.info("Created directory: %s", path)
+        except FileExistsError:
+            pass
         except Exception as e:
-            logging.error(f"Failed to create directory {path}: {e}")
+            logging.error("Failed to create directory %s: %s", path, e)
             return False
+        return True
     
     def validate_path_security(self, path: str) -> bool:
         """
@@ -396,54 +370,85 @@ class PathResolver:
             bool: True if path is safe to use
         """
         try:
-            # Resolve to absolute path
-            abs_path = os.path.abspath(path)
-            project_root = self.get_project_root()
-            
-            # Check if path is within project root
-            return abs_path.startswith(project_root)
+            # The root prefix ends with a separator, so a sibling such as
+            # "<root>_evil" is not mistaken for a path inside the project root
+            root_prefix = _project_root_prefix()
+            real_path = os.path.realpath(path)
+            return real_path.startswith(root_prefix) or real_path + os.sep == root_prefix
         except Exception as e:
-            logging.error(f"Path security validation failed for {path}: {e}")
+            logging.error("Path security validation failed for %s: %s", path, e)
             return False
 
 
-# Convenience functions for backward compatibility and ease of use
-def get_project_root() -> str:
-    """Convenience function to get project root."""
-    return PathResolver.get_project_root()
+# The shared PathResolver, created on first use under _RESOLVER_LOCK
+_RESOLVER: Optional['PathResolver'] = None
+_RESOLVER_LOCK = threading.Lock()
+
+
+def get_resolver() -> 'PathResolver':
+    """
+    Get the shared path resolver, creating it on first use.
+    
+    Returns:
+        PathResolver: The process-wide resolver instance
+    """
+    global _RESOLVER
+    resolver = _RESOLVER
+    if resolver is None:
+        # Double-checked, so threads racing at startup all get the same
+        # instance while later calls never touch the lock
+        with _RESOLVER_LOCK:
+            resolver = _RESOLVER
+            if resolver is None:
+                resolver = object.__new__(PathResolver)
+                resolver.__init__()
+                _RESOLVER = resolver
+    return resolver
 
 
-def get_decks_dir() -> str:
-    """Convenience function to get decks directory."""
-    return PathResolver.get_decks_dir()
+# Resolved configuration shared by the directory getters, built on first use
+_CONFIG: Optional[PathConfig] = None
 
 
-def get_static_dir() -> str:
-    """Convenience function to get static directory."""
-    return PathResolver.get_static_dir()
+def _cfg() -> PathConfig:
+    """The resolved PathConfig, computed once (reset by PathResolver.clear_cache)."""
+    global _CONFIG
+    config = _CONFIG
+    if config is None:
+        config = _CONFIG = get_resolver().get_config()
+    return config
 
 
-def get_images_dir() -> str:
-    """Convenience function to get images directory."""
-    return PathResolver.get_images_dir()
+@functools.lru_cache(maxsize=None)
+def _cached_project_root() -> str:
+    """Memoized PathResolver._compute_project_root (reset by PathResolver.clear_cache)."""
+    return PathResolver._compute_project_root()
 
 
-def get_processing_dir() -> str:
-    """Convenience function to get processing directory."""
-    return PathResolver.get_processing_dir()
+@functools.lru_cache(maxsize=None)
+def _project_root_prefix() -> str:
+    """Symlink-resolved project root plus a trailing separator (reset by clear_cache)."""
+    return os.path.join(os.path.realpath(_cached_project_root()), '')
 
 
-def get_logs_dir() -> str:
-    """Convenience function to get logs directory."""
-    return PathResolver.get_logs_dir()
+@functools.lru_cache(maxsize=None)
+def _cached_backend_dir() -> str:
+    """Memoized backend directory (reset by PathResolver.clear_cache)."""
+    return os.path.dirname(_MODULE_DIR)
 
 
-def resolve_path(relative_path: str) -> str:
-    """Convenience function to resolve relative paths."""
-    return PathResolver.resolve_path(relative_path)
+# Convenience functions for backward compatibility and ease of use. These are
+# bound directly to the cached implementations rather than wrapped, so callers
+# pay for no extra Python frame.
+get_project_root = _cached_project_root
+get_decks_dir = PathResolver.get_decks_dir
+get_static_dir = PathResolver.get_static_dir
+get_images_dir = PathResolver.get_images_dir
+get_processing_dir = PathResolver.get_processing_dir
+get_logs_dir = PathResolver.get_logs_dir
+resolve_path = PathResolver.resolve_path
 
 
 def ensure_directory_exists(path: str) -> bool:
     """Convenience function to ensure directory exists."""
-    resolver = PathResolver()
-    return resolver.ensure_directory_exists(path)
\ No newline at end of file
+    return get_resolver().ensure_directory_exists(path)
\ No newline at end of file
@@ -9,20 +9,220 @@ This module provides centralized performance optimization functions including:
 """
 
 import os
+import atexit
+import shutil
 import gc
 import sys
 import time
 import threading
 import weakref
-from typing import Dict, Any, Optional, List, Callable
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from functools import lru_cache, wraps
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import json
 import hashlib
+import heapq
+import mmap
 import logging
+import sqlite3
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# loky's reusable executor keeps worker processes alive between uses and
+# pickles closures with cloudpickle; plain ProcessPoolExecutor otherwise
+try:
+    import loky
+except ImportError:
+    loky = None
+
+# Cached results are serialized with orjson when available: it produces bytes
+# directly, is several times faster than json and handles numpy arrays
+try:
+    import orjson
+    
+    def _dumps_payload(result: Any) -> bytes:
+        return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    
+    _loads_payload = orjson.loads
+except ImportError:
+    orjson = None
+    
+    def _dumps_payload(result: Any) -> bytes:
+        return json.dumps(result).encode('utf-8')
+    
+    _loads_payload = json.loads
+
+# Cached results are zstd-compressed when zstandard is installed. Compression
+# only happens under FileCache's exclusive lock, so one compressor is shared;
+# decompression runs concurrently, so each thread gets its own decompressor
+try:
+    import zstandard
+    
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_local = threading.local()
+    
+    def _zstd_decompress(data: bytes) -> bytes:
+        decompressor = getattr(_zstd_local, 'decompressor', None)
+        if decompressor is None:
+            decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+        return decompressor.decompress(data)
+    
+    _PAYLOAD_ENCODING = 'zstd'
+except ImportError:
+    zstandard = None
+    _PAYLOAD_ENCODING = 'json'
+
+# Pending FileCache index changes are written to SQLite at most this often
+_INDEX_FLUSH_INTERVAL = 1.0
+
+# Cache file suffix for each payload encoding; 'raw' entries are files cached
+# byte for byte by FileCache.cache_file_bytes
+_PAYLOAD_SUFFIXES = {'json': '.json', 'zstd': '.json.zst', 'raw': '.bin'}
 
 logger = logging.getLogger(__name__)
 
+# Files larger than this are hashed by blake3 straight from a memory map,
+# which spreads the work over all cores
+_MMAP_HASH_MIN_SIZE = 1024 * 1024
+
+# Files up to this size are mapped and hashed in a single update() call;
+# larger ones are streamed in _HASH_CHUNK_SIZE reads
+_MMAP_HASH_MAX_SIZE = 8 * 1024 * 1024
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Bytes read from each end of a file by _quick_fingerprint
+_QUICK_FINGERPRINT_SPAN = 64 * 1024
+
+
+def _file_fingerprint(file_path: str) -> Optional[List[int]]:
+    """
+    Cheap change detector for a file: its size and modification time.
+    
+    Args:
+        file_path: File to fingerprint
+        
+    Returns:
+        [st_size, st_mtime_ns] from a single stat call (a list so it compares
+        equal after a JSON round trip), or None if the file cannot be stat'ed
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _quick_fingerprint(file_path: str) -> str:
+    """
+    Content fingerprint from a file's size and its first and last 64 KiB.
+    
+    Catches nearly all real modifications (rewrites, appends, edited
+    headers or trailers) at a fixed cost of two small reads, whatever the
+    file size. Small files are hashed whole.
+    
+    Args:
+        file_path: File to fingerprint
+        
+    Returns:
+        str: Hex digest of the size, head and tail
+    """
+    hasher = blake3.blake3() if blake3 is not None else hashlib.blake2b(digest_size=32)
+    with open(file_path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        hasher.update(size.to_bytes(8, 'little'))
+        if size <= 2 * _QUICK_FINGERPRINT_SPAN:
+            hasher.update(f.read())
+        else:
+            hasher.update(f.read(_QUICK_FINGERPRINT_SPAN))
+            f.seek(-_QUICK_FINGERPRINT_SPAN, os.SEEK_END)
+            hasher.update(f.read(_QUICK_FINGERPRINT_SPAN))
+    return hasher.hexdigest()
+
+
+def _copy_file_contents(src_path: str, dst_path: str) -> int:
+    """
+    Copy a file's contents, in-kernel with os.copy_file_range where supported.
+    
+    Some filesystems (procfs, some FUSE and overlay mounts) make
+    copy_file_range return 0 before the end of the file, so an in-kernel copy
+    that comes up short of the source size is redone with a plain copy.
+    
+    Args:
+        src_path: File to copy
+        dst_path: Destination, created or truncated
+        
+    Returns:
+        int: Number of bytes copied
+    """
+    with open(src_path, 'rb', buffering=0) as fsrc, open(dst_path, 'wb', buffering=0) as fdst:
+        if hasattr(os, 'copy_file_range'):
+            size = os.fstat(fsrc.fileno()).st_size
+            copied = 0
+            try:
+                while True:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30)
+                    if n == 0:
+                        break
+                    copied += n
+            except OSError as e:
+                # e.g. EXDEV/ENOSYS on older kernels or unsupported filesystems
+                logger.debug(f"copy_file_range unavailable for {src_path}: {e}")
+                copied = 0
+            # Nothing copied is also redone, as procfs files report a size of 0
+            if copied and copied >= size:
+                return copied
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst, 1 << 20)
+        return fdst.tell()
+
+
+@lru_cache(maxsize=256)
+def _hash_file(file_path: str, size: int, mtime_ns: int) -> str:
+    """
+    Hex digest of a file's content, memoized per (path, size, mtime).
+    
+    Including the stat fields in the key means a modified file is hashed
+    again, while repeated lookups of an unchanged one are free.
+    """
+    if blake3 is not None:
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        if size > _MMAP_HASH_MIN_SIZE:
+            hasher.update_mmap(file_path)
+            return hasher.hexdigest()
+    else:
+        hasher = hashlib.sha256()
+    
+    # Unbuffered: the reads below are already large, so Python's
+    # BufferedReader would only add a copy
+    with open(file_path, 'rb', buffering=0) as f:
+        if 0 < size <= _MMAP_HASH_MAX_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        else:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+# Generation-0 allocation threshold for the garbage collector. CPython's
+# default of 700 triggers young collections constantly in allocation-heavy
+# work such as OCR post-processing
+_GC_GEN0_THRESHOLD = 50_000
+
+# Seconds a MemoryManager.get_memory_usage reading is reused
+_MEMORY_USAGE_TTL = 0.1
+
 class MemoryManager:
     """Centralized memory management for the application."""
     
@@ -30,6 +230,40 @@ class MemoryManager:
         self._memory_threshold = 1024 * 1024 * 1024  # 1GB threshold
         self._cleanup_callbacks: List[Callable] = []
         self._lock = threading.Lock()
+        self._gc_start: Optional[float] = None
+        
+        # psutil handle for this process, and the last usage reading with the
+        # time.monotonic() it was taken at
+        self._process = None
+        self._usage_cache: Optional[tuple] = None
+    
+    def tune_gc_threshold(self):
+        """
+        Raise the generation-0 GC threshold so young collections run less often.
+        
+        This changes interpreter-wide state, so it is left to the application
+        entry point to opt in. A threshold that is already higher (or automatic
+        collection being disabled) is left untouched.
+        """
+        gen0, gen1, gen2 = gc.get_threshold()
+        if 0 < gen0 < _GC_GEN0_THRESHOLD:
+            gc.set_threshold(_GC_GEN0_THRESHOLD, gen1, gen2)
+    
+    def register_gc_callback(self):
+        """Log how long each full (generation 2) garbage collection takes."""
+        if self._gc_callback not in gc.callbacks:
+            gc.callbacks.append(self._gc_callback)
+    
+    def _gc_callback(self, phase: str, info: Dict[str, int]):
+        """gc.callbacks hook timing full collections."""
+        if info.get('generation') != 2:
+            return
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            logger.debug(f"Full GC collected {info.get('collected', 0)} objects in "
+                         f"{time.perf_counter() - self._gc_start:.4f}s")
+            self._gc_start = None
     
     def register_cleanup_callback(self, callback: Callable):
         """Register a callback to be called during memory cleanup."""
@@ -37,7 +271,13 @@ class MemoryManager:
             self._cleanup_callbacks.append(callback)
     
     def cleanup_memory(self, force: bool = False):
-        """Perform memory cleanup operations."""
+        """
+        Perform memory cleanup operations.
+        
+        Args:
+            force: Run a full garbage collection instead of only collecting
+                the youngest generation, which is far cheaper
+        """
         try:
             # Call registered cleanup callbacks
             with self._lock:
@@ -47,8 +287,8 @@ class MemoryManager:
                     except Exception as e:
                         logger.warning(f"Cleanup callback failed: {e}")
             
-            # Force garbage collection
-            collected = gc.collect()
+            # Garbage collection
+            collected = gc.collect(2 if force else 0)
             logger.info(f"Memory cleanup: collected {collected} objects")
             
             return True
@@ -57,21 +297,124 @@ class MemoryManager:
             return False
     
     def get_memory_usage(self) -> Dict[str, Any]:
-        """Get current memory usage statistics."""
-        try:
-            import psutil
-            process = psutil.Process()
-            memory_info = process.memory_info()
-            
-            return {
-                'rss': memory_info.rss,
-                'vms': memory_info.vms,
-                'percent': process.memory_percent(),
-                'available': psutil.virtual_memory().available
-            }
-        except ImportError:
+        """
+        Get current memory usage statistics.
+        
+        Readings are reused for _MEMORY_USAGE_TTL seconds, so bursts of calls
+        from monitoring code cost one set of /proc reads.
+        """
+        if psutil is None:
             # Fallback if psutil not available
             return {'error': 'psutil not available'}
+        
+        now = time.monotonic()
+        cached = self._usage_cache
+        if cached is not None and now - cached[0] < _MEMORY_USAGE_TTL:
+            return dict(cached[1])
+        
+        # Recreated after a fork, since the handle is bound to a pid
+        process = self._process
+        if process is None or process.pid != os.getpid():
+            process = self._process = psutil.Process()
+        memory_info = process.memory_info()
+        
+        usage = {
+            'rss': memory_info.rss,
+            'vms': memory_info.vms,
+            'percent': process.memory_percent(),
+            'available': psutil.virtual_memory().available
+        }
+        self._usage_cache = (now, usage)
+        return dict(usage)
+
+class _RWLock:
+    """
+    Shared/exclusive lock: any number of readers, or a single writer.
+    
+    Waiting writers hold off new readers, so a steady stream of lookups
+    cannot starve writes. Not reentrant.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read_locked(self):
+        """Hold the lock shared for the duration of the block."""
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    
+    @contextmanager
+    def write_locked(self):
+        """Hold the lock exclusively for the duration of the block."""
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+class _CacheEntry:
+    """
+    One FileCache index entry.
+    
+    A slotted object rather than a dict, since a large cache holds many of
+    these in memory.
+    """
+    
+    __slots__ = ('timestamp', 'size', 'fingerprint', 'file_hash', 'encoding', 'expires_at', 'quick_hash')
+    
+    def __init__(self, timestamp: float, size: int, fingerprint: Optional[List[int]] = None,
+                 file_hash: str = '', encoding: str = 'json', expires_at: Optional[float] = None,
+                 quick_hash: str = ''):
+        self.timestamp = timestamp
+        self.size = size
+        self.fingerprint = fingerprint  # [st_size, st_mtime_ns] of the source file
+        self.file_hash = file_hash  # Full content hash, for strict entries and older indexes
+        self.encoding = encoding  # Payload encoding, a key of _PAYLOAD_SUFFIXES
+        self.expires_at = expires_at  # time.time() after which the entry is invalid
+        self.quick_hash = quick_hash  # _quick_fingerprint of the source file
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> '_CacheEntry':
+        """Build an entry from its persisted JSON form."""
+        return cls(data.get('timestamp', 0), data.get('size', 0),
+                   data.get('fingerprint'), data.get('file_hash', ''),
+                   data.get('encoding', 'json'), data.get('expires_at'),
+                   data.get('quick_hash', ''))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The persisted JSON form of the entry, omitting unset fields."""
+        data = {'timestamp': self.timestamp, 'size': self.size}
+        if self.fingerprint is not None:
+            data['fingerprint'] = self.fingerprint
+        if self.file_hash:
+            data['file_hash'] = self.file_hash
+        if self.encoding != 'json':
+            data['encoding'] = self.encoding
+        if self.expires_at is not None:
+            data['expires_at'] = self.expires_at
+        if self.quick_hash:
+            data['quick_hash'] = self.quick_hash
+        return data
 
 class FileCache:
     """High-performance file caching system."""
@@ -79,175 +422,552 @@ class FileCache:
     def __init__(self, cache_dir: str, max_size_mb: int = 500):
         self.cache_dir = cache_dir
         self.max_size_bytes = max_size_mb * 1024 * 1024
-        self._cache_index: Dict[str, Dict[str, Any]] = {}
-        self._lock = threading.RLock()
+        # Kept in least- to most-recently-used order, with the total size of
+        # all entries maintained alongside, so eviction never scans or sorts
+        self._cache_index: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_size = 0
+        self._lock = _RWLock()
+        
+        # Keys hit under the shared lock, oldest first. Lookups must not
+        # reorder _cache_index while other readers use it, so the hits are
+        # applied to the LRU order under the exclusive lock by writes
+        self._recent_hits: Dict[str, None] = {}
+        
+        # Min-heap of (expires_at, key) for entries with a TTL. Expired entries
+        # are removed a few at a time by _sweep_expired; heap items left over
+        # from replaced or removed entries are skipped when popped
+        self._ttl_heap: List[tuple] = []
+        
+        # The index is mirrored in memory for lookups and persisted row by row
+        # in SQLite (WAL mode). Changes are collected per key (None marks a
+        # deletion) and written in one transaction at most every
+        # _INDEX_FLUSH_INTERVAL seconds, and on close or interpreter exit
+        self._db_file = os.path.join(cache_dir, 'cache.db')
+        self._pending_index: Dict[str, Optional[_CacheEntry]] = {}
+        self._last_flush = time.monotonic()
+        self._closed = False
         
         # Ensure cache directory exists
         os.makedirs(cache_dir, exist_ok=True)
         
         # Load existing cache index
+        self._db = self._open_db()
         self._load_cache_index()
+        
+        # Flushed on interpreter exit through a weak reference, so the atexit
+        # registration does not keep every FileCache alive
+        self_ref = weakref.ref(self)
+        
+        def flush_at_exit():
+            cache = self_ref()
+            if cache is not None:
+                cache._force_flush()
+        
+        self._flush_at_exit = flush_at_exit
+        atexit.register(flush_at_exit)
+        weakref.finalize(self, atexit.unregister, flush_at_exit)
+    
+    def _open_db(self) -> sqlite3.Connection:
+        """Open the index database, creating its schema on first use."""
+        # All access happens under the exclusive side of self._lock, so the
+        # connection can be shared between threads
+        db = sqlite3.connect(self._db_file, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS entries("
+            "key TEXT PRIMARY KEY, ts REAL, size INTEGER, entry TEXT)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS entries_ts ON entries(ts)")
+        return db
     
     def _load_cache_index(self):
-        """Load cache index from disk."""
-        index_file = os.path.join(self.cache_dir, 'cache_index.json')
+        """Load the cache index from the database, importing a legacy JSON index if present."""
+        legacy_index = os.path.join(self.cache_dir, 'cache_index.json')
+        try:
+            if os.path.exists(legacy_index):
+                with open(legacy_index, 'r') as f:
+                    for key, entry in json.load(f).items():
+                        self._store_index_entry(key, _CacheEntry.from_dict(entry))
+                self._flush_index(force=True)
+                os.remove(legacy_index)
+        except Exception as e:
+            logger.warning(f"Failed to import legacy cache index: {e}")
+        
         try:
-            if os.path.exists(index_file):
-                with open(index_file, 'r') as f:
-                    self._cache_index = json.load(f)
+            self._cache_index = OrderedDict(
+                (key, _CacheEntry.from_dict(json.loads(entry)))
+                for key, entry in self._db.execute("SELECT key, entry FROM entries ORDER BY ts")
+            )
+            self._remove_orphaned_payloads()
         except Exception as e:
             logger.warning(f"Failed to load cache index: {e}")
-            self._cache_index = {}
+            self._cache_index = OrderedDict()
+        self._total_size = sum(entry.size for entry in self._cache_index.values())
+        self._ttl_heap = [
+            (entry.expires_at, key)
+            for key, entry in self._cache_index.items()
+            if entry.expires_at is not None
+        ]
+        heapq.heapify(self._ttl_heap)
+    
+    def _remove_orphaned_payloads(self):
+        """
+        Delete cache files that have no index entry.
+        
+        Index changes are flushed in batches, so after a crash the payloads
+        written since the last flush are on disk without index rows, and
+        nothing would ever evict them.
+        """
+        # Longest suffix first, so '.json.zst' is not taken for '.json'
+        suffixes = sorted(_PAYLOAD_SUFFIXES.items(), key=lambda item: -len(item[1]))
+        removed = 0
+        with os.scandir(self.cache_dir) as entries:
+            for dir_entry in entries:
+                if not dir_entry.is_file(follow_symlinks=False):
+                    continue
+                for encoding, suffix in suffixes:
+                    if dir_entry.name.endswith(suffix):
+                        key = dir_entry.name[:-len(suffix)]
+                        entry = self._cache_index.get(key)
+                        if entry is None or entry.encoding != encoding:
+                            try:
+                                os.remove(dir_entry.path)
+                                removed += 1
+                            except OSError as e:
+                                logger.warning(f"Failed to remove orphaned cache file {dir_entry.name}: {e}")
+                        break
+        if removed:
+            logger.info(f"Removed {removed} orphaned cache files")
+    
+    def _store_index_entry(self, key: str, entry: _CacheEntry):
+        """Queue one index entry to be persisted."""
+        self._pending_index[key] = entry
+        self._flush_index()
+    
+    def _delete_index_entry(self, key: str):
+        """Remove one index entry from memory and queue its removal from the database."""
+        entry = self._cache_index.pop(key, None)
+        if entry is None:
+            return
+        self._total_size -= entry.size
+        self._recent_hits.pop(key, None)
+        self._pending_index[key] = None
+        self._flush_index()
     
-    def _save_cache_index(self):
-        """Save cache index to disk."""
-        index_file = os.path.join(self.cache_dir, 'cache_index.json')
+    def _flush_index(self, force: bool = False):
+        """
+        Write queued index changes to the database in a single transaction.
+        
+        Args:
+            force: Flush even if the last flush was under _INDEX_FLUSH_INTERVAL ago
+        """
+        if not self._pending_index or self._closed:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < _INDEX_FLUSH_INTERVAL:
+            return
+        
+        pending, self._pending_index = self._pending_index, {}
+        self._last_flush = now
         try:
-            with open(index_file, 'w') as f:
-                json.dump(self._cache_index, f)
+            with self._db:
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO entries(key, ts, size, entry) VALUES (?, ?, ?, ?)",
+                    [(key, entry.timestamp, entry.size, json.dumps(entry.to_dict()))
+                     for key, entry in pending.items() if entry is not None]
+                )
+                self._db.executemany(
+                    "DELETE FROM entries WHERE key = ?",
+                    [(key,) for key, entry in pending.items() if entry is None]
+                )
         except Exception as e:
             logger.warning(f"Failed to save cache index: {e}")
     
+    def _force_flush(self):
+        """Write all queued index changes now."""
+        with self._lock.write_locked():
+            self._flush_index(force=True)
+    
+    def close(self):
+        """Flush the index and close the database."""
+        with self._lock.write_locked():
+            if self._closed:
+                return
+            self._flush_index(force=True)
+            self._closed = True
+            self._db.close()
+        atexit.unregister(self._flush_at_exit)
+    
     def _get_file_hash(self, file_path: str) -> str:
-        """Generate hash for file content."""
-        hasher = hashlib.md5()
+        """
+        Generate hash for file content.
+        
+        Uses BLAKE3 when the blake3 package is installed, otherwise SHA-256
+        (hardware accelerated on most current CPUs). Both are much faster per
+        byte than MD5.
+        """
         try:
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+            st = os.stat(file_path)
+            return _hash_file(file_path, st.st_size, st.st_mtime_ns)
         except Exception as e:
             logger.error(f"Failed to hash file {file_path}: {e}")
             return ""
     
+    def _cache_file_path(self, key: str, encoding: str) -> str:
+        """Path of the file holding a cached result in the given encoding."""
+        return os.path.join(self.cache_dir, key + _PAYLOAD_SUFFIXES[encoding])
+    
+    def _source_changed(self, cache_entry: _CacheEntry, file_path: str) -> Tuple[bool, Optional[List[int]]]:
+        """
+        Whether the file a cache entry was computed from has changed since.
+        
+        Returns:
+            (changed, fingerprint): fingerprint is the file's current one when
+            its content still matches but the stored fingerprint does not, so
+            the caller can store it; None otherwise
+        """
+        # An unchanged size/mtime fingerprint (a single stat) is trusted. When
+        # it differs, e.g. the file was only touched or copied, the content
+        # decides: by full hash for strict entries and those from older
+        # indexes, otherwise by the head/tail quick fingerprint
+        fingerprint = _file_fingerprint(file_path)
+        if fingerprint is None:
+            return False, None
+        if cache_entry.fingerprint is not None and fingerprint == cache_entry.fingerprint:
+            return False, None
+        if cache_entry.file_hash:
+            changed = self._get_file_hash(file_path) != cache_entry.file_hash
+        elif cache_entry.quick_hash:
+            try:
+                changed = _quick_fingerprint(file_path) != cache_entry.quick_hash
+            except OSError:
+                changed = True
+        else:
+            changed = True
+        return changed, None if changed else fingerprint
+    
+    def _refresh_fingerprint(self, key: str, cache_entry: _CacheEntry, fingerprint: List[int]):
+        """Store a source file's new fingerprint after its content was found unchanged."""
+        # Under the exclusive lock, and only if the entry was not replaced or
+        # removed in the meantime; later lookups are then a single stat again
+        with self._lock.write_locked():
+            if self._cache_index.get(key) is cache_entry:
+                cache_entry.fingerprint = fingerprint
+                self._store_index_entry(key, cache_entry)
+    
     def get_cached_result(self, key: str, file_path: str = None) -> Optional[Any]:
         """Get cached result if available and valid."""
-        with self._lock:
-            if key not in self._cache_index:
+        now = time.time()
+        # Unlocked peek: another thread may empty the heap between the
+        # check and the index, so an IndexError just means nothing is due
+        try:
+            sweep_due = self._ttl_heap[0][0] <= now
+        except IndexError:
+            sweep_due = False
+        if sweep_due:
+            with self._lock.write_locked():
+                self._sweep_expired(now)
+        
+        # Lookups share the lock, so concurrent hits read and parse their
+        # cache files in parallel
+        with self._lock.read_locked():
+            cache_entry = self._cache_index.get(key)
+            if cache_entry is None:
                 return None
             
-            cache_entry = self._cache_index[key]
-            cache_file = os.path.join(self.cache_dir, f"{key}.json")
+            cache_file = self._cache_file_path(key, cache_entry.encoding)
             
-            # Check if cache file exists
-            if not os.path.exists(cache_file):
-                del self._cache_index[key]
-                return None
+            # Check that the entry has not expired, that the cache file exists
+            # and, if file_path provided, that the source file has not changed
+            stale = (
+                (cache_entry.expires_at is not None and cache_entry.expires_at <= now)
+                or not os.path.exists(cache_file)
+            )
+            refreshed = None
+            if not stale and file_path:
+                stale, refreshed = self._source_changed(cache_entry, file_path)
             
-            # Check file hash if file_path provided
-            if file_path and os.path.exists(file_path):
-                current_hash = self._get_file_hash(file_path)
-                if current_hash != cache_entry.get('file_hash', ''):
-                    # File changed, invalidate cache
-                    self._remove_cache_entry(key)
-                    return None
+            # Files cached byte for byte are returned by path
+            hit = False
+            if not stale and cache_entry.encoding == 'raw':
+                self._record_hit(key)
+                result = cache_file
+                hit = True
+            
+            # Entries written with zstd cannot be decoded once zstandard is
+            # no longer installed, so they are dropped below
+            if not stale and cache_entry.encoding == 'zstd' and zstandard is None:
+                logger.warning(f"zstd entry unreadable: zstandard not installed ({key})")
+                stale = True
             
             # Load and return cached result
-            try:
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load cache entry {key}: {e}")
+            if not stale and not hit:
+                try:
+                    with open(cache_file, 'rb') as f:
+                        data = f.read()
+                    if cache_entry.encoding == 'zstd':
+                        data = _zstd_decompress(data)
+                    result = _loads_payload(data)
+                    self._record_hit(key)
+                    hit = True
+                except Exception as e:
+                    logger.warning(f"Failed to load cache entry {key}: {e}")
+        
+        if hit:
+            if refreshed is not None:
+                self._refresh_fingerprint(key, cache_entry, refreshed)
+            return result
+        
+        # Invalidation takes the exclusive lock; skip it if another thread
+        # already replaced or removed the entry in between
+        with self._lock.write_locked():
+            if self._cache_index.get(key) is cache_entry:
                 self._remove_cache_entry(key)
-                return None
+        return None
     
-    def cache_result(self, key: str, result: Any, file_path: str = None):
-        """Cache a result."""
-        with self._lock:
+    def _record_hit(self, key: str):
+        """Note a cache hit, to be applied to the LRU order by _apply_hits."""
+        # Each dict operation is atomic, and concurrent hits on one key only
+        # race to re-add it at the end
+        self._recent_hits.pop(key, None)
+        self._recent_hits[key] = None
+    
+    def _apply_hits(self):
+        """Move recently hit entries to the most-recently-used end (exclusive lock held)."""
+        hits, self._recent_hits = self._recent_hits, {}
+        for key in hits:
+            if key in self._cache_index:
+                self._cache_index.move_to_end(key)
+    
+    def _sweep_expired(self, now: float, limit: int = 16):
+        """
+        Remove entries whose TTL has passed.
+        
+        Args:
+            now: Current time.time()
+            limit: Maximum number of heap items to pop, so no single lookup
+                pays for a large backlog of expirations
+        """
+        heap = self._ttl_heap
+        while heap and heap[0][0] <= now and limit > 0:
+            expires_at, key = heapq.heappop(heap)
+            limit -= 1
+            entry = self._cache_index.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove_cache_entry(key)
+    
+    def cache_result(self, key: str, result: Any, file_path: str = None, ttl: Optional[float] = None,
+                     strict: bool = False):
+        """
+        Cache a result.
+        
+        Args:
+            key: Cache key
+            result: JSON-serializable result to store
+            file_path: Source file the result was computed from; the entry is
+                invalidated when it changes
+            ttl: Seconds until the entry expires, or None to keep it until evicted
+            strict: Validate against a hash of the whole source file instead
+                of the quick head/tail fingerprint
+        """
+        with self._lock.write_locked():
             try:
-                cache_file = os.path.join(self.cache_dir, f"{key}.json")
+                # A previous entry stored under another encoding has a
+                # different file name, so remove it rather than orphan it
+                previous = self._cache_index.get(key)
+                if previous is not None and previous.encoding != _PAYLOAD_ENCODING:
+                    self._remove_cache_entry(key)
                 
-                # Save result to cache file
-                with open(cache_file, 'w') as f:
-                    json.dump(result, f)
+                cache_file = self._cache_file_path(key, _PAYLOAD_ENCODING)
                 
-                # Update cache index
-                cache_entry = {
-                    'timestamp': time.time(),
-                    'size': os.path.getsize(cache_file)
-                }
+                # Save result to cache file
+                data = _dumps_payload(result)
+                if _PAYLOAD_ENCODING == 'zstd':
+                    data = _zstd_compressor.compress(data)
+                with open(cache_file, 'wb') as f:
+                    f.write(data)
                 
-                if file_path and os.path.exists(file_path):
-                    cache_entry['file_hash'] = self._get_file_hash(file_path)
+                # Update cache index; the size is what was just written, so
+                # no stat is needed
+                self._add_index_entry(key, _PAYLOAD_ENCODING, len(data), file_path, ttl, strict)
                 
-                self._cache_index[key] = cache_entry
-                self._save_cache_index()
+            except Exception as e:
+                logger.error(f"Failed to cache result for {key}: {e}")
+    
+    def cache_file_bytes(self, key: str, src_path: str, file_path: str = None,
+                         ttl: Optional[float] = None, strict: bool = False):
+        """
+        Cache a file's bytes unchanged, e.g. a preprocessed image.
+        
+        The copy is made in-kernel with os.copy_file_range where available,
+        so the data never passes through Python. get_cached_result returns
+        the path of the cached copy for such entries instead of decoding it.
+        
+        Args:
+            key: Cache key
+            src_path: File whose contents are cached
+            file_path: Source file the cached file was derived from; the entry
+                is invalidated when it changes
+            ttl: Seconds until the entry expires, or None to keep it until evicted
+            strict: Validate against a hash of the whole source file instead
+                of the quick head/tail fingerprint
+        """
+        with self._lock.write_locked():
+            try:
+                previous = self._cache_index.get(key)
+                if previous is not None and previous.encoding != 'raw':
+                    self._remove_cache_entry(key)
                 
-                # Check cache size and cleanup if needed
-                self._cleanup_if_needed()
+                size = _copy_file_contents(src_path, self._cache_file_path(key, 'raw'))
+                self._add_index_entry(key, 'raw', size, file_path, ttl, strict)
                 
             except Exception as e:
-                logger.error(f"Failed to cache result for {key}: {e}")
+                logger.error(f"Failed to cache file for {key}: {e}")
+    
+    def _add_index_entry(self, key: str, encoding: str, size: int, file_path: Optional[str],
+                         ttl: Optional[float], strict: bool):
+        """Index a freshly written cache file, replacing any previous entry for the key."""
+        cache_entry = _CacheEntry(
+            time.time(),
+            size,
+            _file_fingerprint(file_path) if file_path else None,
+            encoding=encoding,
+            expires_at=time.time() + ttl if ttl is not None else None
+        )
+        if cache_entry.fingerprint is not None:
+            if strict:
+                cache_entry.file_hash = self._get_file_hash(file_path)
+            else:
+                cache_entry.quick_hash = _quick_fingerprint(file_path)
+        if cache_entry.expires_at is not None:
+            heapq.heappush(self._ttl_heap, (cache_entry.expires_at, key))
+        
+        # Hits made before this write rank below the new entry
+        self._apply_hits()
+        self._delete_index_entry(key)
+        self._cache_index[key] = cache_entry
+        self._total_size += cache_entry.size
+        self._store_index_entry(key, cache_entry)
+        
+        # Check cache size and cleanup if needed
+        self._cleanup_if_needed()
     
     def _remove_cache_entry(self, key: str):
         """Remove a cache entry."""
+        entry = self._cache_index.get(key)
+        encoding = entry.encoding if entry is not None else _PAYLOAD_ENCODING
+        
+        # Dropped from the index first so a file that cannot be deleted
+        # never keeps the entry alive
+        self._delete_index_entry(key)
         try:
-            cache_file = os.path.join(self.cache_dir, f"{key}.json")
+            cache_file = self._cache_file_path(key, encoding)
             if os.path.exists(cache_file):
                 os.remove(cache_file)
-            
-            if key in self._cache_index:
-                del self._cache_index[key]
         except Exception as e:
             logger.warning(f"Failed to remove cache entry {key}: {e}")
     
     def _cleanup_if_needed(self):
         """Cleanup old cache entries if cache size exceeds limit."""
         try:
-            total_size = sum(entry.get('size', 0) for entry in self._cache_index.values())
-            
-            if total_size > self.max_size_bytes:
-                # Sort by timestamp (oldest first)
-                sorted_entries = sorted(
-                    self._cache_index.items(),
-                    key=lambda x: x[1].get('timestamp', 0)
-                )
+            if self._total_size > self.max_size_bytes:
+                self._apply_hits()
                 
-                # Remove oldest entries until under limit
-                for key, entry in sorted_entries:
-                    if total_size <= self.max_size_bytes * 0.8:  # 80% of limit
-                        break
-                    
-                    self._remove_cache_entry(key)
-                    total_size -= entry.get('size', 0)
+                # Remove least recently used entries until under 80% of limit
+                target_size = self.max_size_bytes * 0.8
+                while self._total_size > target_size and self._cache_index:
+                    self._remove_cache_entry(next(iter(self._cache_index)))
                 
-                self._save_cache_index()
-                logger.info(f"Cache cleanup completed, new size: {total_size} bytes")
+                logger.info(f"Cache cleanup completed, new size: {self._total_size} bytes")
         
         except Exception as e:
             logger.error(f"Cache cleanup failed: {e}")
 
+# Number of finished tasks whose status stays available to get_task_status
+_FINISHED_TASK_HISTORY = 1024
+
 class ProcessingPool:
-    """Thread pool for parallel processing operations."""
+    """
+    Worker pools for parallel processing operations.
+    
+    I/O-bound tasks run on a thread pool. CPU-bound tasks (kind='cpu') run on
+    a process pool, created on first use, so they are not serialized by the
+    GIL; on a free-threaded interpreter they stay on threads.
+    """
     
     def __init__(self, max_workers: int = None):
         self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
         self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._cpu_executor = None
         self._active_tasks: Dict[str, Any] = {}
-        self._lock = threading.Lock()
+        # Tasks move here from _active_tasks as soon as they finish, so
+        # fire-and-forget submissions do not accumulate; the oldest are dropped
+        # beyond _FINISHED_TASK_HISTORY
+        self._finished_tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Reentrant: cancelling a future runs its done callback synchronously
+        self._lock = threading.RLock()
+    
+    def _get_cpu_executor(self):
+        """Executor for CPU-bound tasks, created on first use."""
+        if self._cpu_executor is None:
+            gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+            if not gil_enabled:
+                self._cpu_executor = self._executor
+            elif loky is not None:
+                self._cpu_executor = loky.get_reusable_executor(max_workers=os.cpu_count())
+            else:
+                self._cpu_executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return self._cpu_executor
     
-    def submit_task(self, task_id: str, func: Callable, *args, **kwargs):
-        """Submit a task for parallel execution."""
+    def submit_task(self, task_id: str, func: Callable, *args, kind: str = 'io', **kwargs):
+        """
+        Submit a task for parallel execution.
+        
+        Args:
+            task_id: Unique identifier for the task
+            func: Callable to run; for kind='cpu' it and its arguments must
+                be picklable
+            kind: 'io' for the thread pool, 'cpu' for the process pool
+            
+        Returns:
+            The task's Future, or None if a task with this id is still active
+        """
         with self._lock:
             if task_id in self._active_tasks:
                 logger.warning(f"Task {task_id} already active")
                 return None
             
-            future = self._executor.submit(func, *args, **kwargs)
+            executor = self._get_cpu_executor() if kind == 'cpu' else self._executor
+            future = executor.submit(func, *args, **kwargs)
             self._active_tasks[task_id] = {
                 'future': future,
                 'start_time': time.time()
             }
-            
-            return future
+        
+        # Registered outside the lock: it runs immediately if the task is done
+        future.add_done_callback(lambda f, tid=task_id: self._on_task_done(tid, f))
+        return future
+    
+    def _on_task_done(self, task_id: str, future):
+        """Move a finished task from the active table to the bounded history."""
+        with self._lock:
+            task_info = self._active_tasks.get(task_id)
+            if task_info is None or task_info['future'] is not future:
+                return
+            del self._active_tasks[task_id]
+            self._finished_tasks[task_id] = task_info
+            if len(self._finished_tasks) > _FINISHED_TASK_HISTORY:
+                self._finished_tasks.popitem(last=False)
     
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get status of a submitted task."""
         with self._lock:
-            if task_id not in self._active_tasks:
+            task_info = self._active_tasks.get(task_id) or self._finished_tasks.get(task_id)
+            if task_info is None:
                 return None
             
-            task_info = self._active_tasks[task_id]
             future = task_info['future']
             
             status = {
@@ -266,7 +986,8 @@ class ProcessingPool:
                     status['success'] = False
                 
                 # Clean up completed task
-                del self._active_tasks[task_id]
+                self._active_tasks.pop(task_id, None)
+                self._finished_tasks.pop(task_id, None)
             
             return status
     
@@ -280,13 +1001,16 @@ class ProcessingPool:
             cancelled = future.cancel()
             
             if cancelled or future.done():
-                del self._active_tasks[task_id]
+                self._active_tasks.pop(task_id, None)
+                self._finished_tasks.pop(task_id, None)
             
             return cancelled
     
     def shutdown(self, wait: bool = True):
-        """Shutdown the processing pool."""
+        """Shutdown the processing pools."""
         self._executor.shutdown(wait=wait)
+        if self._cpu_executor is not None and self._cpu_executor is not self._executor:
+            self._cpu_executor.shutdown(wait=wait)
 
 # Global instances
 _memory_manager = MemoryManager()
@@ -328,16 +1052,85 @@ def performance_monitor(func):
             raise
     return wrapper
 
-def cached_function(cache_key_func: Callable = None, ttl: int = 3600):
-    """Decorator to cache function results."""
+def _canonical_default(obj: Any) -> Any:
+    """json.dumps default for cache keys: sets sorted by encoding, anything else by repr."""
+    if isinstance(obj, (set, frozenset)):
+        # Iteration order follows per-process string hashing, so sort the
+        # canonical encodings of the members instead
+        return {'__set__': sorted(_canonical_json(item) for item in obj)}
+    return {'__repr__': repr(obj)}
+
+def _canonical_json(value: Any) -> str:
+    """Encoding of a value that depends only on its contents, not on hashing or identity."""
+    try:
+        return json.dumps(value, sort_keys=True, separators=(',', ':'), default=_canonical_default)
+    except (TypeError, ValueError):
+        # e.g. dict keys of mixed types that cannot be sorted
+        return repr(value)
+
+def _default_cache_key(func: Callable, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """
+    Build a cache key for a call that is stable across processes.
+    
+    Args:
+        func: The cached function
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+        
+    Returns:
+        str: The function name plus a BLAKE2b digest of the arguments' canonical
+        JSON encoding, so equal arguments give equal keys whatever the hash
+        seed (unlike pickle, which follows set order and object identity)
+    """
+    if not args and not kwargs:
+        return func.__name__
+    
+    payload = _canonical_json([args, sorted(kwargs.items())]).encode('utf-8')
+    return f"{func.__name__}_{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
+
+# Marks a miss in cached_function's in-memory tier (None is a valid result)
+_MISS = object()
+
+def cached_function(cache_key_func: Callable = None, ttl: int = 3600, maxsize: int = 128):
+    """
+    Decorator to cache function results.
+    
+    Results are kept in a small per-function in-memory LRU for ttl seconds in
+    front of the on-disk FileCache, so repeated calls skip file I/O and JSON
+    parsing entirely. Hits from memory return the same object each time.
+    
+    Args:
+        cache_key_func: Builds the cache key from the call's arguments
+        ttl: Seconds a result stays valid in the in-memory tier
+        maxsize: Maximum number of results held in memory per function
+    """
     def decorator(func):
+        memory_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        memory_lock = threading.Lock()
+        
+        def remember(cache_key: str, result: Any):
+            with memory_lock:
+                memory_cache[cache_key] = (time.monotonic() + ttl, result)
+                memory_cache.move_to_end(cache_key)
+                if len(memory_cache) > maxsize:
+                    memory_cache.popitem(last=False)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
             if cache_key_func:
                 cache_key = cache_key_func(*args, **kwargs)
             else:
-                cache_key = f"{func.__name__}_{hash(str(args) + str(sorted(kwargs.items())))}"
+                cache_key = _default_cache_key(func, args, kwargs)
+            
+            # In-memory tier first; expired results are dropped lazily
+            with memory_lock:
+                expires_at, cached_result = memory_cache.get(cache_key, (0.0, _MISS))
+                if cached_result is not _MISS:
+                    if expires_at > time.monotonic():
+                        memory_cache.move_to_end(cache_key)
+                        return cached_result
+                    del memory_cache[cache_key]
             
             # Try to get from cache
             cache = get_file_cache()
@@ -345,11 +1138,13 @@ def cached_function(cache_key_func: Callable = None, ttl: int = 3600):
             
             if cached_result is not None:
                 logger.debug(f"Cache hit for {func.__name__}")
+                remember(cache_key, cached_result)
                 return cached_result
             
             # Execute function and cache result
             result = func(*args, **kwargs)
-            cache.cache_result(cache_key, result)
+            cache.cache_result(cache_key, result, ttl=ttl)
+            remember(cache_key, result)
             logger.debug(f"Cached result for {func.__name__}")
             
             return result
@@ -361,14 +1156,15 @@ def optimize_for_memory():
     try:
         # Clear caches
         if _file_cache:
-            _file_cache._cleanup_if_needed()
+            with _file_cache._lock.write_locked():
+                _file_cache._cleanup_if_needed()
         
         # Clear PathResolver cache
         from utils.path_resolver import PathResolver
         PathResolver.clear_cache()
         
         # Run memory cleanup
-        _memory_manager.cleanup_memory()
+        _memory_manager.cleanup_memory(force=True)
         
         logger.info("Memory optimization completed")
         return True
@@ -387,9 +1183,8 @@ def get_performance_stats() -> Dict[str, Any]:
     }
     
     if _file_cache:
+        # Both O(1): len() of a dict, and the running total kept by FileCache
         stats['cache_entries'] = len(_file_cache._cache_index)
-        stats['cache_size'] = sum(
-            entry.get('size', 0) for entry in _file_cache._cache_index.values()
-        )
+        stats['cache_size'] = _file_cache._total_size
     
     return stats
\ No newline at end of file